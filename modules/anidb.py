@@ -1,4 +1,4 @@
-import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from modules import util
 from modules.util import Failed
@@ -16,10 +16,19 @@ urls = {
 }
 
 class AniDBObj:
-    def __init__(self, anidb, anidb_id, language):
+    def __init__(self, anidb, anidb_id, language, data=None):
         self.anidb = anidb
         self.anidb_id = anidb_id
         self.language = language
+        if data:
+            self.official_title = data["main_title"]
+            self.title = data["title"]
+            self.rating = data["rating"]
+            self.average = data["average"]
+            self.released = data["released"]
+            self.tags = data["tags"]
+            self.description = data["description"]
+            return
         response = self.anidb._request(f"{urls['anime']}/{anidb_id}")
 
         def parse_page(xpath, is_list=False, is_float=False, is_date=False, fail=False):
@@ -57,11 +66,13 @@ class AniDBObj:
 
 
 class AniDB:
-    def __init__(self, config, language):
+    def __init__(self, config, language, expiration):
         self.config = config
         self.language = language
+        self.expiration = expiration
         self.username = None
         self.password = None
+        self._anime = {}
 
     def login(self, username, password):
         self.username = username
@@ -115,12 +126,48 @@ class AniDB:
             next_page_list = response.xpath("//li[@class='next']/a/@href")
             if len(anidb_ids) >= limit or len(next_page_list) == 0:
                 break
-            time.sleep(2)
             current_url = f"{base_url}{next_page_list[0]}"
         return anidb_ids[:limit]
 
     def get_anime(self, anidb_id):
-        return AniDBObj(self, anidb_id, self.language)
+        if anidb_id in self._anime:
+            return self._anime[anidb_id]
+        expired = None
+        if self.config.Cache:
+            cache_data = self.config.Cache.query_anidb([anidb_id], self.language, self.expiration)
+            if anidb_id in cache_data:
+                anidb_dict, expired = cache_data[anidb_id]
+                if expired is False:
+                    self._anime[anidb_id] = AniDBObj(self, anidb_id, self.language, data=anidb_dict)
+                    return self._anime[anidb_id]
+        anidb = AniDBObj(self, anidb_id, self.language)
+        if self.config.Cache:
+            self.config.Cache.update_anidb(expired, anidb, self.expiration)
+        self._anime[anidb_id] = anidb
+        return anidb
+
+    def prefetch(self, anidb_ids):
+        anidb_ids = [a for a in set(anidb_ids) if a not in self._anime]
+        if not anidb_ids:
+            return
+        cache_data = self.config.Cache.query_anidb(anidb_ids, self.language, self.expiration) if self.config.Cache else {}
+        missing = []
+        for anidb_id in anidb_ids:
+            if anidb_id in cache_data and cache_data[anidb_id][1] is False:
+                self._anime[anidb_id] = AniDBObj(self, anidb_id, self.language, data=cache_data[anidb_id][0])
+            else:
+                missing.append(anidb_id)
+        logger.debug(f"AniDB Prefetch: {len(anidb_ids) - len(missing)} Cached, {len(missing)} to Fetch")
+
+        def get_anime(anidb_id):
+            try:
+                self.get_anime(anidb_id)
+            except Failed as e:
+                logger.error(e)
+
+        with ThreadPoolExecutor(max_workers=self.config.general["max_workers"]) as executor:
+            for future in as_completed([executor.submit(get_anime, a) for a in missing]):
+                future.result()
 
     def get_anidb_ids(self, method, data):
         anidb_ids = []
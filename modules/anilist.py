@@ -1,4 +1,5 @@
-import time
+import math, time
+from concurrent.futures import ThreadPoolExecutor
 from modules import util
 from modules.util import Failed
 
@@ -91,8 +92,6 @@ class AniList:
                 raise Failed(f"AniList Error: Connection Failed")
             else:
                 raise Failed(f"AniList Error: {json_obj['errors'][0]['message']}")
-        else:
-            time.sleep(60 / 90)
         return json_obj
 
     def _validate_id(self, anilist_id):
@@ -103,26 +102,32 @@ class AniList:
         raise Failed(f"AniList Error: No AniList ID found for {anilist_id}")
 
     def _pagenation(self, query, limit=0, variables=None):
-        anilist_ids = []
-        count = 0
-        page_num = 0
         if variables is None:
             variables = {}
-        next_page = True
-        while next_page:
-            page_num += 1
-            variables["page"] = page_num
-            json_obj = self._request(query, variables)
-            next_page = json_obj["data"]["Page"]["pageInfo"]["hasNextPage"]
-            for media in json_obj["data"]["Page"]["media"]:
-                if media["id"]:
-                    anilist_ids.append(media["id"])
-                    count += 1
-                    if 0 < limit == count:
+
+        def get_page(page_num):
+            json_obj = self._request(query, {**variables, "page": page_num})
+            return json_obj["data"]["Page"]["pageInfo"], [m["id"] for m in json_obj["data"]["Page"]["media"] if m["id"]]
+
+        page_info, anilist_ids = get_page(1)
+        per_page = page_info["perPage"] if "perPage" in page_info and page_info["perPage"] else len(anilist_ids)
+        last_page = math.ceil(limit / per_page) if limit > 0 and per_page else None
+        if "lastPage" in page_info and page_info["lastPage"]:
+            last_page = min(last_page, page_info["lastPage"]) if last_page else page_info["lastPage"]
+        page_num = 1
+        next_page = page_info["hasNextPage"]
+        with ThreadPoolExecutor(max_workers=self.config.general["max_workers"]) as executor:
+            while next_page and not 0 < limit <= len(anilist_ids):
+                end_page = page_num + self.config.general["max_workers"]
+                if last_page and last_page > page_num:
+                    end_page = min(end_page, last_page)
+                for page_info, page_ids in executor.map(get_page, range(page_num + 1, end_page + 1)):
+                    page_num += 1
+                    anilist_ids.extend(page_ids)
+                    next_page = page_info["hasNextPage"]
+                    if not next_page:
                         break
-            if 0 < limit == count:
-                break
-        return anilist_ids
+        return anilist_ids[:limit] if limit > 0 else anilist_ids
 
     def _search(self, **kwargs):
         media_vars = f"sort: {sort_options[kwargs['sort_by']]}, type: ANIME"
@@ -156,7 +161,7 @@ class AniList:
                 elif mod == "lte":
                     value += 1
                 media_vars += f", {final}: {value}"
-        query = f"query ($page: Int) {{Page(page: $page){{pageInfo {{hasNextPage}}media({media_vars}){{id}}}}}}"
+        query = f"query ($page: Int) {{Page(page: $page){{pageInfo {{hasNextPage perPage lastPage}}media({media_vars}){{id}}}}}}"
         logger.debug(query)
         return self._pagenation(query, limit=kwargs["limit"], variables=variables)
 
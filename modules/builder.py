@@ -1,4 +1,5 @@
 import os, re, time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from modules import anidb, anilist, flixpatrol, icheckmovies, imdb, letterboxd, mal, plex, radarr, reciperr, sonarr, tautulli, tmdb, trakt, tvdb, mdblist, util
 from modules.util import Failed, NonExisting, NotScheduled, NotScheduledRange, Deleted
@@ -131,6 +132,14 @@ all_filters = boolean_filters + special_filters + \
               [f"{f}{m}" for f in tag_filters for m in tag_modifiers] + \
               [f"{f}{m}" for f in date_filters for m in date_modifiers] + \
               [f"{f}{m}" for f in number_filters for m in number_modifiers]
+pushdown_filters = {
+    "year": [".gt", ".gte", ".lt", ".lte"], "plays": [".gt", ".gte", ".lt", ".lte"],
+    "critic_rating": [".gt", ".gte"], "audience_rating": [".gt", ".gte"], "user_rating": [".gt", ".gte"],
+    "added": ["", ".not", ".before", ".after"], "release": ["", ".not", ".before", ".after"],
+    "genre": ["", ".not"], "content_rating": ["", ".not"], "country": ["", ".not"], "label": ["", ".not"],
+    "collection": ["", ".not"], "network": ["", ".not"], "resolution": ["", ".not"],
+    "audio_language": ["", ".not"], "subtitle_language": ["", ".not"]
+}
 date_attributes = plex.date_attributes + ["first_episode_aired", "last_episode_aired", "last_episode_aired_or_never"]
 year_attributes = plex.year_attributes + ["tmdb_year"]
 number_attributes = plex.number_attributes + ["channels", "height", "width"]
@@ -360,8 +369,8 @@ class CollectionBuilder:
         self.item_details = {}
         self.radarr_details = {}
         self.sonarr_details = {}
-        self.missing_movies = []
-        self.missing_shows = []
+        self.missing_movies = {}
+        self.missing_shows = {}
         self.missing_parts = []
         self.added_to_radarr = []
         self.added_to_sonarr = []
@@ -369,6 +378,7 @@ class CollectionBuilder:
         self.filters = []
         self.tmdb_filters = []
         self.added_items = []
+        self.added_keys = set()
         self.filtered_items = []
         self.filtered_keys = {}
         self.run_again_movies = []
@@ -768,6 +778,11 @@ class CollectionBuilder:
         self.do_missing = not self.config.no_missing and (self.details["show_missing"] or self.details["save_report"]
                                                           or (self.library.Radarr and self.radarr_details["add_missing"])
                                                           or (self.library.Sonarr and self.sonarr_details["add_missing"]))
+        if self.filters and not self.smart and not self.details["show_filtered"] and not self.details["save_report"] \
+                and not self.details["only_filter_missing"] and self.builder_level in ["movie", "show", "artist"] and all([b == ("plex_all", self.builder_level) for b in self.builders]):
+            self.push_filters()
+        self.compiled_filters = self.library.compile_filters(self.filters)
+        self.filters_reload = any([r for _, _, r in self.compiled_filters])
         if self.build_collection:
             try:
                 self.obj = self.library.get_playlist(self.name) if self.playlist else self.library.get_collection(self.name)
@@ -1493,6 +1508,26 @@ class CollectionBuilder:
                 else:
                     logger.error(message)
 
+    def push_filters(self):
+        pushed = {}
+        residual = []
+        for filter_final, filter_data in self.filters:
+            filter_attr, modifier, _ = self.library.split(filter_final)
+            if filter_attr in pushdown_filters and modifier in pushdown_filters[filter_attr] \
+                    and not (filter_attr in tag_filters and modifier == "" and len(filter_data) > 1):
+                pushed[filter_final] = filter_data
+            else:
+                residual.append((filter_final, filter_data))
+        if pushed:
+            try:
+                search_data = self.build_filter("plex_search", {"all": pushed})
+            except Failed as e:
+                logger.debug(f"Filter Pushdown Skipped: {e}")
+            else:
+                logger.debug(f"Filters Pushed to Plex: {', '.join(pushed)}")
+                self.builders = [("plex_search", search_data)]
+                self.filters = residual
+
     def gather_ids(self, method, value):
         expired = None
         list_key = None
@@ -1600,13 +1635,13 @@ class CollectionBuilder:
                                                 self.missing_parts.append(f"{show_item.title} Season: {season_num} Episode: {episode_num} Missing")
                                             break
                                     if not found and tvdb_id not in self.missing_shows and self.do_missing:
-                                        self.missing_shows.append(tvdb_id)
+                                        self.missing_shows[tvdb_id] = None
                                 elif tmdb_type == "movie" and self.do_missing and _id not in self.missing_movies:
-                                    self.missing_movies.append(_id)
+                                    self.missing_movies[_id] = None
                                 elif tmdb_type == "show" and self.do_missing:
                                     tvdb_id = self.config.Convert.tmdb_to_tvdb(_id, fail=True)
                                     if tvdb_id not in self.missing_shows:
-                                        self.missing_shows.append(tvdb_id)
+                                        self.missing_shows[tvdb_id] = None
                             except Failed as e:
                                 logger.warning(e)
                                 continue
@@ -1620,7 +1655,7 @@ class CollectionBuilder:
                                 rating_keys = pl_library.movie_map[input_id]
                                 break
                         if not found and input_id not in self.missing_movies:
-                            self.missing_movies.append(input_id)
+                            self.missing_movies[input_id] = None
                 elif id_type in ["tvdb", "tmdb_show"] and not self.parts_collection:
                     if id_type == "tmdb_show":
                         try:
@@ -1638,7 +1673,7 @@ class CollectionBuilder:
                                 rating_keys = pl_library.show_map[tvdb_id]
                                 break
                         if not found and tvdb_id not in self.missing_shows:
-                            self.missing_shows.append(tvdb_id)
+                            self.missing_shows[tvdb_id] = None
                 elif id_type == "tvdb_season" and (self.builder_level == "season" or self.playlist):
                     tvdb_id, season_num = input_id.split("_")
                     tvdb_id = int(tvdb_id)
@@ -1657,7 +1692,7 @@ class CollectionBuilder:
                                 self.missing_parts.append(f"{show_item.title} Season: {season_num} Missing")
                             break
                     if not found and tvdb_id not in self.missing_shows:
-                        self.missing_shows.append(tvdb_id)
+                        self.missing_shows[tvdb_id] = None
                 elif id_type == "tvdb_episode" and (self.builder_level == "episode" or self.playlist):
                     tvdb_id, season_num, episode_num = input_id.split("_")
                     tvdb_id = int(tvdb_id)
@@ -1671,7 +1706,7 @@ class CollectionBuilder:
                             except NotFound:
                                 self.missing_parts.append(f"{show_item.title} Season: {season_num} Episode: {episode_num} Missing")
                     if not found and tvdb_id not in self.missing_shows and self.do_missing:
-                        self.missing_shows.append(tvdb_id)
+                        self.missing_shows[tvdb_id] = None
                 else:
                     continue
 
@@ -1710,11 +1745,18 @@ class CollectionBuilder:
             logger.info("")
             logger.info("Filtering Builders:")
         filtered_items = []
+        if self.tmdb_filters and not self.details["only_filter_missing"]:
+            rating_keys = [item.ratingKey for item in items if isinstance(item, (Movie, Show)) and item.ratingKey not in self.added_keys and item.ratingKey not in self.filtered_keys]
+            self.prefetch_tmdb(
+                movie_ids=[self.library.movie_rating_key_map[k] for k in rating_keys if k in self.library.movie_rating_key_map],
+                tvdb_ids=[self.library.show_rating_key_map[k] for k in rating_keys if k in self.library.show_rating_key_map and k not in self.library.movie_rating_key_map],
+                ignore_cache=True
+            )
         for i, item in enumerate(items, 1):
             if not isinstance(item, (Movie, Show, Season, Episode, Artist, Album, Track)):
                 logger.error(f"{self.Type} Error: Item: {item} is an invalid type")
                 continue
-            if item not in self.added_items:
+            if item.ratingKey not in self.added_keys:
                 if item.ratingKey in self.filtered_keys:
                     if self.details["show_filtered"] is True:
                         logger.info(f"{name} {self.Type} | X | {self.filtered_keys[item.ratingKey]}")
@@ -1722,6 +1764,7 @@ class CollectionBuilder:
                     current_title = util.item_title(item)
                     if self.check_filters(item, f"{(' ' * (max_length - len(str(i))))}{i}/{total}"):
                         self.added_items.append(item)
+                        self.added_keys.add(item.ratingKey)
                     else:
                         filtered_items.append(item)
                         self.filtered_keys[item.ratingKey] = current_title
@@ -2083,6 +2126,7 @@ class CollectionBuilder:
         logger.separator(f"Adding to {self.name} {self.Type}", space=False, border=False)
         logger.info("")
         name, collection_items = self.library.get_collection_name_and_items(self.obj if self.obj else self.name, self.smart_label_collection)
+        collection_keys = {i.ratingKey for i in collection_items}
         total = self.limit if self.limit and len(self.added_items) > self.limit else len(self.added_items)
         spacing = len(str(total)) * 2 + 1
         amount_added = 0
@@ -2093,10 +2137,10 @@ class CollectionBuilder:
                 logger.info(f"{self.Type} Limit reached")
                 self.added_items = self.added_items[:i-1]
                 break
-            current_operation = "=" if item in collection_items else "+"
+            current_operation = "=" if item.ratingKey in collection_keys else "+"
             number_text = f"{i}/{total}"
             logger.info(f"{number_text:>{spacing}} | {name} {self.Type} | {current_operation} | {util.item_title(item)}")
-            if item in collection_items:
+            if item.ratingKey in collection_keys:
                 self.remove_item_map[item.ratingKey] = None
                 amount_unchanged += 1
             else:
@@ -2148,6 +2192,14 @@ class CollectionBuilder:
             logger.info(f"{amount_removed} {self.builder_level.capitalize()}{'s' if amount_removed == 1 else ''} Removed")
         return amount_removed
 
+    def prefetch_tmdb(self, movie_ids=None, tvdb_ids=None, ignore_cache=False):
+        if movie_ids:
+            self.config.TMDb.prefetch(movie_ids, True, ignore_cache=ignore_cache)
+        if tvdb_ids:
+            with ThreadPoolExecutor(max_workers=self.config.general["max_workers"]) as executor:
+                tmdb_ids = list(executor.map(self.config.Convert.tvdb_to_tmdb, set(tvdb_ids)))
+            self.config.TMDb.prefetch(tmdb_ids, False, ignore_cache=ignore_cache)
+
     def check_tmdb_filter(self, item_id, is_movie, item=None, check_released=False):
         if self.tmdb_filters or check_released:
             try:
@@ -2223,7 +2275,8 @@ class CollectionBuilder:
     def check_filters(self, item, display):
         if (self.filters or self.tmdb_filters) and not self.details["only_filter_missing"]:
             logger.ghost(f"Filtering {display} {item.title}")
-            item = self.library.reload(item)
+            if self.filters_reload:
+                item = self.library.reload(item)
             if self.tmdb_filters and isinstance(item, (Movie, Show)):
                 if item.ratingKey not in self.library.movie_rating_key_map and item.ratingKey not in self.library.show_rating_key_map:
                     logger.warning(f"Filter Error: No {'TMDb' if self.library.is_movie else 'TVDb'} ID found for {item.title}")
@@ -2238,7 +2291,7 @@ class CollectionBuilder:
                     return False
                 if not self.check_tmdb_filter(t_id, item.ratingKey in self.library.movie_rating_key_map):
                     return False
-            if self.library.check_filters(item, self.filters, self.current_time) is False:
+            if self.library.check_filters(item, self.compiled_filters, self.current_time) is False:
                 return False
         return True
 
@@ -2252,6 +2305,7 @@ class CollectionBuilder:
                 logger.info("")
             missing_movies_with_names = []
             filtered_movies_with_names = []
+            self.prefetch_tmdb(movie_ids=self.missing_movies)
             for missing_id in self.missing_movies:
                 try:
                     movie = self.config.TMDb.get_movie(missing_id)
@@ -2298,6 +2352,9 @@ class CollectionBuilder:
                 logger.info("")
             missing_shows_with_names = []
             filtered_shows_with_names = []
+            self.config.TVDb.prefetch(self.missing_shows)
+            if self.tmdb_filters or self.details["missing_only_released"]:
+                self.prefetch_tmdb(tvdb_ids=self.missing_shows, ignore_cache=True)
             for missing_id in self.missing_shows:
                 try:
                     title = self.config.TVDb.get_tvdb_obj(missing_id).title
@@ -2369,7 +2426,7 @@ class CollectionBuilder:
         sync_genres = self.item_details["item_genres.sync"] if "item_genres.sync" in self.item_details else None
 
         if "non_item_remove_label" in self.item_details:
-            rk_compare = [item.ratingKey for item in self.items]
+            rk_compare = {item.ratingKey for item in self.items}
             for non_item in self.library.search(label=self.item_details["non_item_remove_label"], libtype=self.builder_level):
                 if non_item.ratingKey not in rk_compare:
                     self.library.edit_tags("label", non_item, remove_tags=self.item_details["non_item_remove_label"])
@@ -2635,13 +2692,28 @@ class CollectionBuilder:
                 plex_search["any"] = {"collection": self.name}
             search_data = self.build_filter("plex_search", plex_search)
             items = self.library.get_filter_items(search_data[2])
+        current_positions = {item.ratingKey: i for i, item in enumerate(self.items)}
+        keep = util.longest_increasing_subsequence([current_positions[item.ratingKey] if item.ratingKey in current_positions else None for item in items])
+        runs = []
         previous = None
-        for i, item in enumerate(items, 0):
-            if len(self.items) <= i or item.ratingKey != self.items[i].ratingKey:
+        for i, item in enumerate(items):
+            if i not in keep:
+                if not runs or runs[-1][-1][0] is not previous:
+                    runs.append([])
                 text = f"after {util.item_title(previous)}" if previous else "to the beginning"
                 logger.info(f"Moving {util.item_title(item)} {text}")
-                self.library.moveItem(self.obj, item, previous)
+                runs[-1].append((item, previous))
             previous = item
+        logger.info(f"{sum([len(r) for r in runs])} Move{'s' if sum([len(r) for r in runs]) != 1 else ''} for {len(items)} {self.builder_level.capitalize()}s")
+
+        def move_run(run):
+            for move_item, after in run:
+                with self.library.write_semaphore:
+                    self.library.moveItem(self.obj, move_item, after)
+
+        with ThreadPoolExecutor(max_workers=self.config.general["max_plex_writes"]) as executor:
+            for future in as_completed([executor.submit(move_run, r) for r in runs]):
+                future.result()
 
     def sync_trakt_list(self):
         logger.info("")
@@ -2728,6 +2800,7 @@ class CollectionBuilder:
     def run_collections_again(self):
         self.obj = self.library.get_collection(self.name)
         name, collection_items = self.library.get_collection_name_and_items(self.obj, self.smart_label_collection)
+        collection_keys = {i.ratingKey for i in collection_items}
         self.created = False
         rating_keys = []
         amount_added = 0
@@ -2748,7 +2821,7 @@ class CollectionBuilder:
                 except (BadRequest, NotFound):
                     logger.error(f"Plex Error: Item {rating_key} not found")
                     continue
-                if current in collection_items:
+                if current.ratingKey in collection_keys:
                     logger.info(f"{name} {self.Type} | = | {util.item_title(current)}")
                 else:
                     self.library.alter_collection(current, name, smart_label_collection=self.smart_label_collection)
@@ -2781,6 +2854,7 @@ class CollectionBuilder:
 
         if len(self.run_again_shows) > 0 and self.library.is_show:
             logger.info("")
+            self.config.TVDb.prefetch([missing_id for missing_id in self.run_again_shows if missing_id not in self.library.show_map])
             for missing_id in self.run_again_shows:
                 if missing_id not in self.library.show_map:
                     try:
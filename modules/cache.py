@@ -5,6 +5,8 @@ from modules import util
 
 logger = util.logger
 
+http_cache_retention = 7
+
 class Cache:
     def __init__(self, config_path, expiration):
         self.cache_path = f"{os.path.splitext(config_path)[0]}.cache"
@@ -28,6 +30,7 @@ class Cache:
                 cursor.execute("DROP TABLE IF EXISTS omdb_data2")
                 cursor.execute("DROP TABLE IF EXISTS tvdb_data")
                 cursor.execute("DROP TABLE IF EXISTS tvdb_data2")
+                cursor.execute("DROP TABLE IF EXISTS tvdb_map")
                 cursor.execute("DROP TABLE IF EXISTS overlay_ratings")
                 cursor.execute(
                     """CREATE TABLE IF NOT EXISTS guids_map (
@@ -67,6 +70,20 @@ class Cache:
                     tmdb_id TEXT,
                     expiration_date TEXT)"""
                 )
+                cursor.execute(
+                    """CREATE TABLE IF NOT EXISTS radarr_lookup_map (
+                    key INTEGER PRIMARY KEY,
+                    tmdb_id TEXT UNIQUE,
+                    folder TEXT,
+                    expiration_date TEXT)"""
+                )
+                cursor.execute(
+                    """CREATE TABLE IF NOT EXISTS sonarr_lookup_map (
+                    key INTEGER PRIMARY KEY,
+                    tvdb_id TEXT UNIQUE,
+                    folder TEXT,
+                    expiration_date TEXT)"""
+                )
                 cursor.execute(
                     """CREATE TABLE IF NOT EXISTS flixpatrol_map (
                     key INTEGER PRIMARY KEY,
@@ -118,6 +135,20 @@ class Cache:
                     certification TEXT,
                     expiration_date TEXT)"""
                 )
+                cursor.execute(
+                    """CREATE TABLE IF NOT EXISTS anidb_data (
+                    key INTEGER PRIMARY KEY,
+                    anidb_id INTEGER UNIQUE,
+                    language TEXT,
+                    main_title TEXT,
+                    title TEXT,
+                    rating REAL,
+                    average REAL,
+                    released TEXT,
+                    tags TEXT,
+                    description TEXT,
+                    expiration_date TEXT)"""
+                )
                 cursor.execute(
                     """CREATE TABLE IF NOT EXISTS tmdb_movie_data (
                     key INTEGER PRIMARY KEY,
@@ -182,10 +213,12 @@ class Cache:
                     expiration_date TEXT)"""
                 )
                 cursor.execute(
-                    """CREATE TABLE IF NOT EXISTS tvdb_map (
+                    """CREATE TABLE IF NOT EXISTS tvdb_map2 (
                     key INTEGER PRIMARY KEY,
                     tvdb_url TEXT UNIQUE,
                     tvdb_id INTEGER,
+                    tmdb_id INTEGER,
+                    imdb_id TEXT,
                     expiration_date TEXT)"""
                 )
                 cursor.execute(
@@ -197,6 +230,21 @@ class Cache:
                     kitsu TEXT,
                     expiration_date TEXT)"""
                 )
+                cursor.execute(
+                    """CREATE TABLE IF NOT EXISTS anime_ids (
+                    key INTEGER PRIMARY KEY,
+                    anidb_id INTEGER UNIQUE,
+                    mal_id INTEGER,
+                    anilist_id INTEGER,
+                    imdb_id TEXT,
+                    tvdb_id INTEGER)"""
+                )
+                cursor.execute(
+                    """CREATE TABLE IF NOT EXISTS anime_ids_source (
+                    key INTEGER PRIMARY KEY,
+                    url TEXT UNIQUE,
+                    etag TEXT)"""
+                )
                 cursor.execute(
                     """CREATE TABLE IF NOT EXISTS image_maps (
                     key INTEGER PRIMARY KEY,
@@ -228,6 +276,43 @@ class Cache:
                     media_id TEXT,
                     media_type TEXT)"""
                 )
+                cursor.execute(
+                    """CREATE TABLE IF NOT EXISTS library_snapshots (
+                    key INTEGER PRIMARY KEY,
+                    library TEXT UNIQUE,
+                    snapshot_at INTEGER,
+                    expiration_date TEXT)"""
+                )
+                cursor.execute("SELECT count(name) FROM sqlite_master WHERE type='table' AND name='library_snapshot'")
+                new_snapshot = cursor.fetchone()[0] == 0
+                cursor.execute(
+                    """CREATE TABLE IF NOT EXISTS library_snapshot (
+                    key INTEGER PRIMARY KEY,
+                    library TEXT,
+                    rating_key INTEGER,
+                    guid TEXT,
+                    media_type TEXT,
+                    t_id TEXT,
+                    imdb_id TEXT,
+                    title TEXT,
+                    year INTEGER,
+                    updated_at INTEGER,
+                    UNIQUE(library, rating_key))"""
+                )
+                if new_snapshot:
+                    cursor.execute("DELETE FROM list_ids WHERE list_key IN (SELECT key FROM list_cache WHERE list_type = 'library')")
+                    cursor.execute("DELETE FROM list_cache WHERE list_type = 'library'")
+                cursor.execute(
+                    """CREATE TABLE IF NOT EXISTS http_cache (
+                    key INTEGER PRIMARY KEY,
+                    cache_key TEXT UNIQUE,
+                    url TEXT,
+                    content BLOB,
+                    etag TEXT,
+                    last_modified TEXT,
+                    expiration_date TEXT)"""
+                )
+                cursor.execute("DELETE FROM http_cache WHERE expiration_date < ?", ((datetime.now() - timedelta(days=http_cache_retention)).strftime("%Y-%m-%d %H:%M:%S"),))
                 cursor.execute(
                     """CREATE TABLE IF NOT EXISTS imdb_parental (
                     key INTEGER PRIMARY KEY,
@@ -285,6 +370,22 @@ class Cache:
                     expired = time_between_insertion.days > self.expiration
         return id_to_return, imdb_id, media_type, expired
 
+    def query_guid_maps(self, plex_guids):
+        guid_maps = {}
+        with sqlite3.connect(self.cache_path) as connection:
+            connection.row_factory = sqlite3.Row
+            with closing(connection.cursor()) as cursor:
+                for i in range(0, len(plex_guids), 500):
+                    chunk = plex_guids[i:i + 500]
+                    cursor.execute(f"SELECT * FROM guids_map WHERE plex_guid IN ({', '.join(['?'] * len(chunk))})", chunk)
+                    for row in cursor.fetchall():
+                        time_between_insertion = datetime.now() - datetime.strptime(row["expiration_date"], "%Y-%m-%d")
+                        guid_maps[row["plex_guid"]] = (
+                            util.get_list(row["t_id"], int_list=True), util.get_list(row["imdb_id"]),
+                            row["media_type"], time_between_insertion.days > self.expiration
+                        )
+        return guid_maps
+
     def update_guid_map(self, plex_guid, t_id, imdb_id, expired, media_type):
         expiration_date = datetime.now() if expired is True else (datetime.now() - timedelta(days=random.randint(1, self.expiration)))
         with sqlite3.connect(self.cache_path) as connection:
@@ -328,12 +429,36 @@ class Cache:
     def update_letterboxd_map(self, expired, letterboxd_id, tmdb_id):
         self._update_map("letterboxd_map", "letterboxd_id", letterboxd_id, "tmdb_id", tmdb_id, expired)
 
+    def query_letterboxd_maps(self, letterboxd_ids):
+        return self._query_maps("letterboxd_map", letterboxd_ids, "letterboxd_id", "tmdb_id")
+
+    def update_letterboxd_maps(self, letterboxd_maps):
+        self._update_maps("letterboxd_map", "letterboxd_id", "tmdb_id", letterboxd_maps)
+
     def query_flixpatrol_map(self, flixpatrol_id, media_type):
         return self._query_map("flixpatrol_map", flixpatrol_id, "flixpatrol_id", "tmdb_id", media_type=media_type)
 
     def update_flixpatrol_map(self, expired, flixpatrol_id, tmdb_id, media_type):
         self._update_map("flixpatrol_map", "flixpatrol_id", flixpatrol_id, "tmdb_id", tmdb_id, expired, media_type=media_type)
 
+    def query_flixpatrol_maps(self, flixpatrol_ids, media_type):
+        return self._query_maps("flixpatrol_map", flixpatrol_ids, "flixpatrol_id", "tmdb_id", media_type=media_type)
+
+    def update_flixpatrol_maps(self, flixpatrol_maps, media_type):
+        self._update_maps("flixpatrol_map", "flixpatrol_id", "tmdb_id", flixpatrol_maps, media_type=media_type)
+
+    def query_radarr_lookups(self, tmdb_ids):
+        return self._query_maps("radarr_lookup_map", tmdb_ids, "tmdb_id", "folder")
+
+    def update_radarr_lookups(self, lookups):
+        self._update_maps("radarr_lookup_map", "tmdb_id", "folder", lookups)
+
+    def query_sonarr_lookups(self, tvdb_ids):
+        return self._query_maps("sonarr_lookup_map", tvdb_ids, "tvdb_id", "folder")
+
+    def update_sonarr_lookups(self, lookups):
+        self._update_maps("sonarr_lookup_map", "tvdb_id", "folder", lookups)
+
     def _query_map(self, map_name, _id, from_id, to_id, media_type=None, return_type=False):
         id_to_return = None
         expired = None
@@ -376,33 +501,79 @@ class Cache:
                     sql = f"UPDATE {map_name} SET {val2_name} = ?, expiration_date = ?, media_type = ? WHERE {val1_name} = ?"
                     cursor.execute(sql, (val2, expiration_date.strftime("%Y-%m-%d"), media_type, val1))
 
+    def _query_maps(self, map_name, _ids, from_id, to_id, media_type=None):
+        id_maps = {}
+        with sqlite3.connect(self.cache_path) as connection:
+            connection.row_factory = sqlite3.Row
+            with closing(connection.cursor()) as cursor:
+                for i in range(0, len(_ids), 500):
+                    chunk = list(_ids[i:i + 500])
+                    sql = f"SELECT * FROM {map_name} WHERE {from_id} IN ({', '.join(['?'] * len(chunk))})"
+                    if media_type is not None:
+                        sql += " AND media_type = ?"
+                        chunk.append(media_type)
+                    cursor.execute(sql, chunk)
+                    for row in cursor.fetchall():
+                        if row[to_id]:
+                            datetime_object = datetime.strptime(row["expiration_date"], "%Y-%m-%d")
+                            time_between_insertion = datetime.now() - datetime_object
+                            if "_" in row[to_id]:
+                                id_to_return = row[to_id]
+                            else:
+                                try:
+                                    id_to_return = int(row[to_id])
+                                except ValueError:
+                                    id_to_return = row[to_id]
+                            id_maps[row[from_id]] = (id_to_return, time_between_insertion.days > self.expiration)
+        return id_maps
+
+    def _update_maps(self, map_name, val1_name, val2_name, id_maps, media_type=None):
+        final_maps = []
+        for val1, val2, expired in id_maps:
+            expiration_date = datetime.now() if expired is True else (datetime.now() - timedelta(days=random.randint(1, self.expiration)))
+            final_maps.append((val2, expiration_date.strftime("%Y-%m-%d"), val1) if media_type is None else (val2, expiration_date.strftime("%Y-%m-%d"), media_type, val1))
+        with sqlite3.connect(self.cache_path) as connection:
+            connection.row_factory = sqlite3.Row
+            with closing(connection.cursor()) as cursor:
+                cursor.executemany(f"INSERT OR IGNORE INTO {map_name}({val1_name}) VALUES(?)", [(m[-1],) for m in final_maps])
+                if media_type is None:
+                    sql = f"UPDATE {map_name} SET {val2_name} = ?, expiration_date = ? WHERE {val1_name} = ?"
+                else:
+                    sql = f"UPDATE {map_name} SET {val2_name} = ?, expiration_date = ?, media_type = ? WHERE {val1_name} = ?"
+                cursor.executemany(sql, final_maps)
+
     def query_omdb(self, imdb_id, expiration):
-        omdb_dict = {}
-        expired = None
+        return self.query_omdbs([imdb_id], expiration).get(imdb_id, ({}, None))
+
+    def query_omdbs(self, imdb_ids, expiration):
+        omdb_dicts = {}
         with sqlite3.connect(self.cache_path) as connection:
             connection.row_factory = sqlite3.Row
             with closing(connection.cursor()) as cursor:
-                cursor.execute("SELECT * FROM omdb_data3 WHERE imdb_id = ?", (imdb_id,))
-                row = cursor.fetchone()
-                if row:
-                    omdb_dict["imdbID"] = row["imdb_id"] if row["imdb_id"] else None
-                    omdb_dict["Title"] = row["title"] if row["title"] else None
-                    omdb_dict["Year"] = row["year"] if row["year"] else None
-                    omdb_dict["Released"] = row["released"] if row["released"] else None
-                    omdb_dict["Rated"] = row["content_rating"] if row["content_rating"] else None
-                    omdb_dict["Genre"] = row["genres"] if row["genres"] else None
-                    omdb_dict["imdbRating"] = row["imdb_rating"] if row["imdb_rating"] else None
-                    omdb_dict["imdbVotes"] = row["imdb_votes"] if row["imdb_votes"] else None
-                    omdb_dict["Metascore"] = row["metacritic_rating"] if row["metacritic_rating"] else None
-                    omdb_dict["Type"] = row["type"] if row["type"] else None
-                    omdb_dict["seriesID"] = row["series_id"] if row["series_id"] else None
-                    omdb_dict["Season"] = row["season_num"] if row["season_num"] else None
-                    omdb_dict["Episode"] = row["episode_num"] if row["episode_num"] else None
-                    omdb_dict["Response"] = "True"
-                    datetime_object = datetime.strptime(row["expiration_date"], "%Y-%m-%d")
-                    time_between_insertion = datetime.now() - datetime_object
-                    expired = time_between_insertion.days > expiration
-        return omdb_dict, expired
+                imdb_ids = list(imdb_ids)
+                for i in range(0, len(imdb_ids), 500):
+                    chunk = imdb_ids[i:i + 500]
+                    cursor.execute(f"SELECT * FROM omdb_data3 WHERE imdb_id IN ({', '.join(['?'] * len(chunk))})", chunk)
+                    for row in cursor.fetchall():
+                        omdb_dict = {}
+                        omdb_dict["imdbID"] = row["imdb_id"] if row["imdb_id"] else None
+                        omdb_dict["Title"] = row["title"] if row["title"] else None
+                        omdb_dict["Year"] = row["year"] if row["year"] else None
+                        omdb_dict["Released"] = row["released"] if row["released"] else None
+                        omdb_dict["Rated"] = row["content_rating"] if row["content_rating"] else None
+                        omdb_dict["Genre"] = row["genres"] if row["genres"] else None
+                        omdb_dict["imdbRating"] = row["imdb_rating"] if row["imdb_rating"] else None
+                        omdb_dict["imdbVotes"] = row["imdb_votes"] if row["imdb_votes"] else None
+                        omdb_dict["Metascore"] = row["metacritic_rating"] if row["metacritic_rating"] else None
+                        omdb_dict["Type"] = row["type"] if row["type"] else None
+                        omdb_dict["seriesID"] = row["series_id"] if row["series_id"] else None
+                        omdb_dict["Season"] = row["season_num"] if row["season_num"] else None
+                        omdb_dict["Episode"] = row["episode_num"] if row["episode_num"] else None
+                        omdb_dict["Response"] = "True"
+                        datetime_object = datetime.strptime(row["expiration_date"], "%Y-%m-%d")
+                        time_between_insertion = datetime.now() - datetime_object
+                        omdb_dicts[row["imdb_id"]] = (omdb_dict, time_between_insertion.days > expiration)
+        return omdb_dicts
 
     def update_omdb(self, expired, omdb, expiration):
         expiration_date = datetime.now() if expired is True else (datetime.now() - timedelta(days=random.randint(1, expiration)))
@@ -419,39 +590,44 @@ class Cache:
                     omdb.season_num, omdb.episode_num, expiration_date.strftime("%Y-%m-%d"), omdb.imdb_id))
 
     def query_mdb(self, key_id, expiration):
-        mdb_dict = {}
-        expired = None
+        return self.query_mdbs([key_id], expiration).get(key_id, ({}, None))
+
+    def query_mdbs(self, key_ids, expiration):
+        mdb_dicts = {}
         with sqlite3.connect(self.cache_path) as connection:
             connection.row_factory = sqlite3.Row
             with closing(connection.cursor()) as cursor:
-                cursor.execute("SELECT * FROM mdb_data3 WHERE key_id = ?", (key_id,))
-                row = cursor.fetchone()
-                if row:
-                    mdb_dict["title"] = row["title"] if row["title"] else None
-                    mdb_dict["year"] = row["year"] if row["year"] else None
-                    mdb_dict["released"] = row["released"] if row["released"] else None
-                    mdb_dict["type"] = row["type"] if row["type"] else None
-                    mdb_dict["imdbid"] = row["imdbid"] if row["imdbid"] else None
-                    mdb_dict["traktid"] = row["traktid"] if row["traktid"] else None
-                    mdb_dict["tmdbid"] = row["tmdbid"] if row["tmdbid"] else None
-                    mdb_dict["score"] = row["score"] if row["score"] else None
-                    mdb_dict["commonsense"] = row["commonsense"] if row["commonsense"] else None
-                    mdb_dict["certification"] = row["certification"] if row["certification"] else None
-                    mdb_dict["ratings"] = [
-                        {"source": "imdb", "value": row["imdb_rating"] if row["imdb_rating"] else None},
-                        {"source": "metacritic", "value": row["metacritic_rating"] if row["metacritic_rating"] else None},
-                        {"source": "metacriticuser", "value": row["metacriticuser_rating"] if row["metacriticuser_rating"] else None},
-                        {"source": "trakt", "value": row["trakt_rating"] if row["trakt_rating"] else None},
-                        {"source": "tomatoes", "value": row["tomatoes_rating"] if row["tomatoes_rating"] else None},
-                        {"source": "tomatoesaudience", "value": row["tomatoesaudience_rating"] if row["tomatoesaudience_rating"] else None},
-                        {"source": "tmdb", "value": row["tmdb_rating"] if row["tmdb_rating"] else None},
-                        {"source": "letterboxd", "value": row["letterboxd_rating"] if row["letterboxd_rating"] else None},
-                        {"source": "myanimelist_rating", "value": row["myanimelist_rating"] if row["myanimelist_rating"] else None}
-                    ]
-                    datetime_object = datetime.strptime(row["expiration_date"], "%Y-%m-%d")
-                    time_between_insertion = datetime.now() - datetime_object
-                    expired = time_between_insertion.days > expiration
-        return mdb_dict, expired
+                key_ids = list(key_ids)
+                for i in range(0, len(key_ids), 500):
+                    chunk = key_ids[i:i + 500]
+                    cursor.execute(f"SELECT * FROM mdb_data3 WHERE key_id IN ({', '.join(['?'] * len(chunk))})", chunk)
+                    for row in cursor.fetchall():
+                        mdb_dict = {}
+                        mdb_dict["title"] = row["title"] if row["title"] else None
+                        mdb_dict["year"] = row["year"] if row["year"] else None
+                        mdb_dict["released"] = row["released"] if row["released"] else None
+                        mdb_dict["type"] = row["type"] if row["type"] else None
+                        mdb_dict["imdbid"] = row["imdbid"] if row["imdbid"] else None
+                        mdb_dict["traktid"] = row["traktid"] if row["traktid"] else None
+                        mdb_dict["tmdbid"] = row["tmdbid"] if row["tmdbid"] else None
+                        mdb_dict["score"] = row["score"] if row["score"] else None
+                        mdb_dict["commonsense"] = row["commonsense"] if row["commonsense"] else None
+                        mdb_dict["certification"] = row["certification"] if row["certification"] else None
+                        mdb_dict["ratings"] = [
+                            {"source": "imdb", "value": row["imdb_rating"] if row["imdb_rating"] else None},
+                            {"source": "metacritic", "value": row["metacritic_rating"] if row["metacritic_rating"] else None},
+                            {"source": "metacriticuser", "value": row["metacriticuser_rating"] if row["metacriticuser_rating"] else None},
+                            {"source": "trakt", "value": row["trakt_rating"] if row["trakt_rating"] else None},
+                            {"source": "tomatoes", "value": row["tomatoes_rating"] if row["tomatoes_rating"] else None},
+                            {"source": "tomatoesaudience", "value": row["tomatoesaudience_rating"] if row["tomatoesaudience_rating"] else None},
+                            {"source": "tmdb", "value": row["tmdb_rating"] if row["tmdb_rating"] else None},
+                            {"source": "letterboxd", "value": row["letterboxd_rating"] if row["letterboxd_rating"] else None},
+                            {"source": "myanimelist_rating", "value": row["myanimelist_rating"] if row["myanimelist_rating"] else None}
+                        ]
+                        datetime_object = datetime.strptime(row["expiration_date"], "%Y-%m-%d")
+                        time_between_insertion = datetime.now() - datetime_object
+                        mdb_dicts[row["key_id"]] = (mdb_dict, time_between_insertion.days > expiration)
+        return mdb_dicts
 
     def update_mdb(self, expired, key_id, mdb, expiration):
         expiration_date = datetime.now() if expired is True else (datetime.now() - timedelta(days=random.randint(1, expiration)))
@@ -471,36 +647,78 @@ class Cache:
                     expiration_date.strftime("%Y-%m-%d"), key_id
                 ))
 
+    def query_anidb(self, anidb_ids, language, expiration):
+        anidb_dicts = {}
+        with sqlite3.connect(self.cache_path) as connection:
+            connection.row_factory = sqlite3.Row
+            with closing(connection.cursor()) as cursor:
+                anidb_ids = list(anidb_ids)
+                for i in range(0, len(anidb_ids), 500):
+                    chunk = anidb_ids[i:i + 500]
+                    cursor.execute(f"SELECT * FROM anidb_data WHERE language = ? AND anidb_id IN ({', '.join(['?'] * len(chunk))})", (language, *chunk))
+                    for row in cursor.fetchall():
+                        datetime_object = datetime.strptime(row["expiration_date"], "%Y-%m-%d")
+                        time_between_insertion = datetime.now() - datetime_object
+                        anidb_dicts[row["anidb_id"]] = ({
+                            "main_title": row["main_title"],
+                            "title": row["title"],
+                            "rating": row["rating"] if row["rating"] else 0,
+                            "average": row["average"] if row["average"] else 0,
+                            "released": datetime.strptime(row["released"], "%Y-%m-%d") if row["released"] else None,
+                            "tags": row["tags"].split("|") if row["tags"] else [],
+                            "description": row["description"] if row["description"] else ""
+                        }, time_between_insertion.days > expiration)
+        return anidb_dicts
+
+    def update_anidb(self, expired, anidb, expiration):
+        expiration_date = datetime.now() if expired is True else (datetime.now() - timedelta(days=random.randint(1, expiration)))
+        with sqlite3.connect(self.cache_path) as connection:
+            connection.row_factory = sqlite3.Row
+            with closing(connection.cursor()) as cursor:
+                cursor.execute("INSERT OR IGNORE INTO anidb_data(anidb_id) VALUES(?)", (anidb.anidb_id,))
+                update_sql = "UPDATE anidb_data SET language = ?, main_title = ?, title = ?, rating = ?, average = ?, " \
+                             "released = ?, tags = ?, description = ?, expiration_date = ? WHERE anidb_id = ?"
+                cursor.execute(update_sql, (
+                    anidb.language, anidb.official_title, anidb.title, anidb.rating, anidb.average,
+                    anidb.released.strftime("%Y-%m-%d") if anidb.released else None, "|".join(anidb.tags),
+                    anidb.description, expiration_date.strftime("%Y-%m-%d"), anidb.anidb_id
+                ))
+
     def query_tmdb_movie(self, tmdb_id, expiration):
-        tmdb_dict = {}
-        expired = None
+        return self.query_tmdb_movies([tmdb_id], expiration).get(tmdb_id, ({}, None))
+
+    def query_tmdb_movies(self, tmdb_ids, expiration):
+        tmdb_dicts = {}
         with sqlite3.connect(self.cache_path) as connection:
             connection.row_factory = sqlite3.Row
             with closing(connection.cursor()) as cursor:
-                cursor.execute("SELECT * FROM tmdb_movie_data WHERE tmdb_id = ?", (tmdb_id,))
-                row = cursor.fetchone()
-                if row:
-                    tmdb_dict["title"] = row["title"] if row["title"] else ""
-                    tmdb_dict["original_title"] = row["original_title"] if row["original_title"] else ""
-                    tmdb_dict["studio"] = row["studio"] if row["studio"] else ""
-                    tmdb_dict["overview"] = row["overview"] if row["overview"] else ""
-                    tmdb_dict["tagline"] = row["tagline"] if row["tagline"] else ""
-                    tmdb_dict["imdb_id"] = row["imdb_id"] if row["imdb_id"] else ""
-                    tmdb_dict["poster_url"] = row["poster_url"] if row["poster_url"] else ""
-                    tmdb_dict["backdrop_url"] = row["backdrop_url"] if row["backdrop_url"] else ""
-                    tmdb_dict["vote_count"] = row["vote_count"] if row["vote_count"] else 0
-                    tmdb_dict["vote_average"] = row["vote_average"] if row["vote_average"] else 0
-                    tmdb_dict["language_iso"] = row["language_iso"] if row["language_iso"] else None
-                    tmdb_dict["language_name"] = row["language_name"] if row["language_name"] else None
-                    tmdb_dict["genres"] = row["genres"] if row["genres"] else ""
-                    tmdb_dict["keywords"] = row["keywords"] if row["keywords"] else ""
-                    tmdb_dict["release_date"] = datetime.strptime(row["release_date"], "%Y-%m-%d") if row["release_date"] else None
-                    tmdb_dict["collection_id"] = row["collection_id"] if row["collection_id"] else None
-                    tmdb_dict["collection_name"] = row["collection_name"] if row["collection_name"] else None
-                    datetime_object = datetime.strptime(row["expiration_date"], "%Y-%m-%d")
-                    time_between_insertion = datetime.now() - datetime_object
-                    expired = time_between_insertion.days > expiration
-        return tmdb_dict, expired
+                tmdb_ids = list(tmdb_ids)
+                for i in range(0, len(tmdb_ids), 500):
+                    chunk = tmdb_ids[i:i + 500]
+                    cursor.execute(f"SELECT * FROM tmdb_movie_data WHERE tmdb_id IN ({', '.join(['?'] * len(chunk))})", chunk)
+                    for row in cursor.fetchall():
+                        tmdb_dict = {}
+                        tmdb_dict["title"] = row["title"] if row["title"] else ""
+                        tmdb_dict["original_title"] = row["original_title"] if row["original_title"] else ""
+                        tmdb_dict["studio"] = row["studio"] if row["studio"] else ""
+                        tmdb_dict["overview"] = row["overview"] if row["overview"] else ""
+                        tmdb_dict["tagline"] = row["tagline"] if row["tagline"] else ""
+                        tmdb_dict["imdb_id"] = row["imdb_id"] if row["imdb_id"] else ""
+                        tmdb_dict["poster_url"] = row["poster_url"] if row["poster_url"] else ""
+                        tmdb_dict["backdrop_url"] = row["backdrop_url"] if row["backdrop_url"] else ""
+                        tmdb_dict["vote_count"] = row["vote_count"] if row["vote_count"] else 0
+                        tmdb_dict["vote_average"] = row["vote_average"] if row["vote_average"] else 0
+                        tmdb_dict["language_iso"] = row["language_iso"] if row["language_iso"] else None
+                        tmdb_dict["language_name"] = row["language_name"] if row["language_name"] else None
+                        tmdb_dict["genres"] = row["genres"] if row["genres"] else ""
+                        tmdb_dict["keywords"] = row["keywords"] if row["keywords"] else ""
+                        tmdb_dict["release_date"] = datetime.strptime(row["release_date"], "%Y-%m-%d") if row["release_date"] else None
+                        tmdb_dict["collection_id"] = row["collection_id"] if row["collection_id"] else None
+                        tmdb_dict["collection_name"] = row["collection_name"] if row["collection_name"] else None
+                        datetime_object = datetime.strptime(row["expiration_date"], "%Y-%m-%d")
+                        time_between_insertion = datetime.now() - datetime_object
+                        tmdb_dicts[row["tmdb_id"]] = (tmdb_dict, time_between_insertion.days > expiration)
+        return tmdb_dicts
 
     def update_tmdb_movie(self, expired, obj, expiration):
         expiration_date = datetime.now() if expired is True else (datetime.now() - timedelta(days=random.randint(1, expiration)))
@@ -520,39 +738,44 @@ class Cache:
                 ))
 
     def query_tmdb_show(self, tmdb_id, expiration):
-        tmdb_dict = {}
-        expired = None
+        return self.query_tmdb_shows([tmdb_id], expiration).get(tmdb_id, ({}, None))
+
+    def query_tmdb_shows(self, tmdb_ids, expiration):
+        tmdb_dicts = {}
         with sqlite3.connect(self.cache_path) as connection:
             connection.row_factory = sqlite3.Row
             with closing(connection.cursor()) as cursor:
-                cursor.execute("SELECT * FROM tmdb_show_data WHERE tmdb_id = ?", (tmdb_id,))
-                row = cursor.fetchone()
-                if row:
-                    tmdb_dict["title"] = row["title"] if row["title"] else ""
-                    tmdb_dict["original_title"] = row["original_title"] if row["original_title"] else ""
-                    tmdb_dict["studio"] = row["studio"] if row["studio"] else ""
-                    tmdb_dict["overview"] = row["overview"] if row["overview"] else ""
-                    tmdb_dict["tagline"] = row["tagline"] if row["tagline"] else ""
-                    tmdb_dict["imdb_id"] = row["imdb_id"] if row["imdb_id"] else ""
-                    tmdb_dict["poster_url"] = row["poster_url"] if row["poster_url"] else ""
-                    tmdb_dict["backdrop_url"] = row["backdrop_url"] if row["backdrop_url"] else ""
-                    tmdb_dict["vote_count"] = row["vote_count"] if row["vote_count"] else 0
-                    tmdb_dict["vote_average"] = row["vote_average"] if row["vote_average"] else 0
-                    tmdb_dict["language_iso"] = row["language_iso"] if row["language_iso"] else None
-                    tmdb_dict["language_name"] = row["language_name"] if row["language_name"] else None
-                    tmdb_dict["genres"] = row["genres"] if row["genres"] else ""
-                    tmdb_dict["keywords"] = row["keywords"] if row["keywords"] else ""
-                    tmdb_dict["first_air_date"] = datetime.strptime(row["first_air_date"], "%Y-%m-%d") if row["first_air_date"] else None
-                    tmdb_dict["last_air_date"] = datetime.strptime(row["last_air_date"], "%Y-%m-%d") if row["last_air_date"] else None
-                    tmdb_dict["status"] = row["status"] if row["status"] else None
-                    tmdb_dict["type"] = row["type"] if row["type"] else None
-                    tmdb_dict["tvdb_id"] = row["tvdb_id"] if row["tvdb_id"] else None
-                    tmdb_dict["countries"] = row["countries"] if row["countries"] else ""
-                    tmdb_dict["seasons"] = row["seasons"] if row["seasons"] else ""
-                    datetime_object = datetime.strptime(row["expiration_date"], "%Y-%m-%d")
-                    time_between_insertion = datetime.now() - datetime_object
-                    expired = time_between_insertion.days > expiration
-        return tmdb_dict, expired
+                tmdb_ids = list(tmdb_ids)
+                for i in range(0, len(tmdb_ids), 500):
+                    chunk = tmdb_ids[i:i + 500]
+                    cursor.execute(f"SELECT * FROM tmdb_show_data WHERE tmdb_id IN ({', '.join(['?'] * len(chunk))})", chunk)
+                    for row in cursor.fetchall():
+                        tmdb_dict = {}
+                        tmdb_dict["title"] = row["title"] if row["title"] else ""
+                        tmdb_dict["original_title"] = row["original_title"] if row["original_title"] else ""
+                        tmdb_dict["studio"] = row["studio"] if row["studio"] else ""
+                        tmdb_dict["overview"] = row["overview"] if row["overview"] else ""
+                        tmdb_dict["tagline"] = row["tagline"] if row["tagline"] else ""
+                        tmdb_dict["imdb_id"] = row["imdb_id"] if row["imdb_id"] else ""
+                        tmdb_dict["poster_url"] = row["poster_url"] if row["poster_url"] else ""
+                        tmdb_dict["backdrop_url"] = row["backdrop_url"] if row["backdrop_url"] else ""
+                        tmdb_dict["vote_count"] = row["vote_count"] if row["vote_count"] else 0
+                        tmdb_dict["vote_average"] = row["vote_average"] if row["vote_average"] else 0
+                        tmdb_dict["language_iso"] = row["language_iso"] if row["language_iso"] else None
+                        tmdb_dict["language_name"] = row["language_name"] if row["language_name"] else None
+                        tmdb_dict["genres"] = row["genres"] if row["genres"] else ""
+                        tmdb_dict["keywords"] = row["keywords"] if row["keywords"] else ""
+                        tmdb_dict["first_air_date"] = datetime.strptime(row["first_air_date"], "%Y-%m-%d") if row["first_air_date"] else None
+                        tmdb_dict["last_air_date"] = datetime.strptime(row["last_air_date"], "%Y-%m-%d") if row["last_air_date"] else None
+                        tmdb_dict["status"] = row["status"] if row["status"] else None
+                        tmdb_dict["type"] = row["type"] if row["type"] else None
+                        tmdb_dict["tvdb_id"] = row["tvdb_id"] if row["tvdb_id"] else None
+                        tmdb_dict["countries"] = row["countries"] if row["countries"] else ""
+                        tmdb_dict["seasons"] = row["seasons"] if row["seasons"] else ""
+                        datetime_object = datetime.strptime(row["expiration_date"], "%Y-%m-%d")
+                        time_between_insertion = datetime.now() - datetime_object
+                        tmdb_dicts[row["tmdb_id"]] = (tmdb_dict, time_between_insertion.days > expiration)
+        return tmdb_dicts
 
     def update_tmdb_show(self, expired, obj, expiration):
         expiration_date = datetime.now() if expired is True else (datetime.now() - timedelta(days=random.randint(1, expiration)))
@@ -574,26 +797,31 @@ class Cache:
                 ))
 
     def query_tvdb(self, tvdb_id, is_movie, expiration):
-        tvdb_dict = {}
-        expired = None
+        return self.query_tvdbs([tvdb_id], is_movie, expiration).get(tvdb_id, ({}, None))
+
+    def query_tvdbs(self, tvdb_ids, is_movie, expiration):
+        tvdb_dicts = {}
         with sqlite3.connect(self.cache_path) as connection:
             connection.row_factory = sqlite3.Row
             with closing(connection.cursor()) as cursor:
-                cursor.execute("SELECT * FROM tvdb_data3 WHERE tvdb_id = ? and type = ?", (tvdb_id, "movie" if is_movie else "show"))
-                row = cursor.fetchone()
-                if row:
-                    tvdb_dict["tvdb_id"] = int(row["tvdb_id"]) if row["tvdb_id"] else 0
-                    tvdb_dict["type"] = row["type"] if row["type"] else ""
-                    tvdb_dict["title"] = row["title"] if row["title"] else ""
-                    tvdb_dict["summary"] = row["summary"] if row["summary"] else ""
-                    tvdb_dict["poster_url"] = row["poster_url"] if row["poster_url"] else ""
-                    tvdb_dict["background_url"] = row["background_url"] if row["background_url"] else ""
-                    tvdb_dict["release_date"] = datetime.strptime(row["release_date"], "%Y-%m-%d") if row["release_date"] else None
-                    tvdb_dict["genres"] = row["genres"] if row["genres"] else ""
-                    datetime_object = datetime.strptime(row["expiration_date"], "%Y-%m-%d")
-                    time_between_insertion = datetime.now() - datetime_object
-                    expired = time_between_insertion.days > expiration
-        return tvdb_dict, expired
+                tvdb_ids = list(tvdb_ids)
+                for i in range(0, len(tvdb_ids), 500):
+                    chunk = tvdb_ids[i:i + 500]
+                    cursor.execute(f"SELECT * FROM tvdb_data3 WHERE type = ? AND tvdb_id IN ({', '.join(['?'] * len(chunk))})", ("movie" if is_movie else "show", *chunk))
+                    for row in cursor.fetchall():
+                        tvdb_dict = {}
+                        tvdb_dict["tvdb_id"] = int(row["tvdb_id"]) if row["tvdb_id"] else 0
+                        tvdb_dict["type"] = row["type"] if row["type"] else ""
+                        tvdb_dict["title"] = row["title"] if row["title"] else ""
+                        tvdb_dict["summary"] = row["summary"] if row["summary"] else ""
+                        tvdb_dict["poster_url"] = row["poster_url"] if row["poster_url"] else ""
+                        tvdb_dict["background_url"] = row["background_url"] if row["background_url"] else ""
+                        tvdb_dict["release_date"] = datetime.strptime(row["release_date"], "%Y-%m-%d") if row["release_date"] else None
+                        tvdb_dict["genres"] = row["genres"] if row["genres"] else ""
+                        datetime_object = datetime.strptime(row["expiration_date"], "%Y-%m-%d")
+                        time_between_insertion = datetime.now() - datetime_object
+                        tvdb_dicts[int(row["tvdb_id"])] = (tvdb_dict, time_between_insertion.days > expiration)
+        return tvdb_dicts
 
     def update_tvdb(self, expired, obj, expiration):
         expiration_date = datetime.now() if expired is True else (datetime.now() - timedelta(days=random.randint(1, expiration)))
@@ -611,26 +839,30 @@ class Cache:
 
     def query_tvdb_map(self, tvdb_url, expiration):
         tvdb_id = None
+        tmdb_id = None
+        imdb_id = None
         expired = None
         with sqlite3.connect(self.cache_path) as connection:
             connection.row_factory = sqlite3.Row
             with closing(connection.cursor()) as cursor:
-                cursor.execute("SELECT * FROM tvdb_map WHERE tvdb_url = ?", (tvdb_url, ))
+                cursor.execute("SELECT * FROM tvdb_map2 WHERE tvdb_url = ?", (tvdb_url, ))
                 row = cursor.fetchone()
                 if row:
                     tvdb_id = int(row["tvdb_id"]) if row["tvdb_id"] else None
+                    tmdb_id = int(row["tmdb_id"]) if row["tmdb_id"] else None
+                    imdb_id = row["imdb_id"] if row["imdb_id"] else None
                     datetime_object = datetime.strptime(row["expiration_date"], "%Y-%m-%d")
                     time_between_insertion = datetime.now() - datetime_object
                     expired = time_between_insertion.days > expiration
-        return tvdb_id, expired
+        return tvdb_id, tmdb_id, imdb_id, expired
 
-    def update_tvdb_map(self, expired, tvdb_url, tvdb_id, expiration):
+    def update_tvdb_map(self, expired, tvdb_url, tvdb_id, tmdb_id, imdb_id, expiration):
         expiration_date = datetime.now() if expired is True else (datetime.now() - timedelta(days=random.randint(1, expiration)))
         with sqlite3.connect(self.cache_path) as connection:
             connection.row_factory = sqlite3.Row
             with closing(connection.cursor()) as cursor:
-                cursor.execute("INSERT OR IGNORE INTO tvdb_map(tvdb_url) VALUES(?)", (tvdb_url, ))
-                cursor.execute("UPDATE tvdb_map SET tvdb_id = ?, expiration_date = ? WHERE tvdb_url = ?", (tvdb_id, expiration_date.strftime("%Y-%m-%d"), tvdb_url))
+                cursor.execute("INSERT OR IGNORE INTO tvdb_map2(tvdb_url) VALUES(?)", (tvdb_url, ))
+                cursor.execute("UPDATE tvdb_map2 SET tvdb_id = ?, tmdb_id = ?, imdb_id = ?, expiration_date = ? WHERE tvdb_url = ?", (tvdb_id, tmdb_id, imdb_id, expiration_date.strftime("%Y-%m-%d"), tvdb_url))
 
     def query_anime_map(self, anime_id, id_type):
         ids = None
@@ -660,6 +892,30 @@ class Cache:
                 cursor.execute("INSERT OR IGNORE INTO anime_map(anidb) VALUES(?)", (anime_ids["anidb"],))
                 cursor.execute("UPDATE anime_map SET anilist = ?, myanimelist = ?, kitsu = ?, expiration_date = ? WHERE anidb = ?", (anime_ids["anidb"], anime_ids["myanimelist"], anime_ids["kitsu"], expiration_date.strftime("%Y-%m-%d"), anime_ids["anidb"]))
 
+    def query_anime_ids(self, url):
+        etag = None
+        anime_ids = []
+        with sqlite3.connect(self.cache_path) as connection:
+            connection.row_factory = sqlite3.Row
+            with closing(connection.cursor()) as cursor:
+                cursor.execute("SELECT * FROM anime_ids_source WHERE url = ?", (url,))
+                row = cursor.fetchone()
+                if row:
+                    etag = row["etag"]
+                cursor.execute("SELECT * FROM anime_ids")
+                for row in cursor:
+                    anime_ids.append((row["anidb_id"], row["mal_id"], row["anilist_id"], row["imdb_id"], row["tvdb_id"]))
+        return etag, anime_ids
+
+    def update_anime_ids(self, url, etag, anime_ids):
+        with sqlite3.connect(self.cache_path) as connection:
+            connection.row_factory = sqlite3.Row
+            with closing(connection.cursor()) as cursor:
+                cursor.execute("DELETE FROM anime_ids")
+                cursor.executemany("INSERT OR IGNORE INTO anime_ids(anidb_id, mal_id, anilist_id, imdb_id, tvdb_id) VALUES(?, ?, ?, ?, ?)", anime_ids)
+                cursor.execute("INSERT OR IGNORE INTO anime_ids_source(url) VALUES(?)", (url,))
+                cursor.execute("UPDATE anime_ids_source SET etag = ? WHERE url = ?", (etag, url))
+
     def get_image_table_name(self, library):
         table_name = None
         with sqlite3.connect(self.cache_path) as connection:
@@ -808,6 +1064,77 @@ class Cache:
             with closing(connection.cursor()) as cursor:
                 cursor.execute(f"DELETE FROM list_ids WHERE list_key = ?", (list_key,))
 
+    def query_library_snapshot(self, library, expiration):
+        snapshot = []
+        snapshot_at = None
+        expired = None
+        with sqlite3.connect(self.cache_path) as connection:
+            connection.row_factory = sqlite3.Row
+            with closing(connection.cursor()) as cursor:
+                cursor.execute("SELECT * FROM library_snapshots WHERE library = ?", (library,))
+                row = cursor.fetchone()
+                if row and row["snapshot_at"]:
+                    datetime_object = datetime.strptime(row["expiration_date"], "%Y-%m-%d")
+                    time_between_insertion = datetime.now() - datetime_object
+                    snapshot_at = row["snapshot_at"]
+                    expired = time_between_insertion.days > expiration
+                    cursor.execute("SELECT * FROM library_snapshot WHERE library = ?", (library,))
+                    for row in cursor:
+                        snapshot.append({
+                            "rating_key": row["rating_key"],
+                            "guid": row["guid"],
+                            "media_type": row["media_type"],
+                            "t_id": util.get_list(row["t_id"], int_list=True) if row["t_id"] else [],
+                            "imdb_id": util.get_list(row["imdb_id"]) if row["imdb_id"] else [],
+                            "title": row["title"],
+                            "year": row["year"],
+                            "updated_at": row["updated_at"]
+                        })
+        return snapshot, snapshot_at, expired
+
+    def update_library_snapshot(self, library, snapshot_at, items, full, expiration):
+        with sqlite3.connect(self.cache_path) as connection:
+            connection.row_factory = sqlite3.Row
+            with closing(connection.cursor()) as cursor:
+                if full:
+                    cursor.execute("DELETE FROM library_snapshot WHERE library = ?", (library,))
+                cursor.executemany("INSERT OR IGNORE INTO library_snapshot(library, rating_key) VALUES(?, ?)", [(library, i[0]) for i in items])
+                cursor.executemany("UPDATE library_snapshot SET guid = ?, media_type = ?, t_id = ?, imdb_id = ?, title = ?, year = ?, "
+                                   "updated_at = ? WHERE library = ? AND rating_key = ?",
+                                   [(*i[1:], library, i[0]) for i in items])
+                cursor.execute("INSERT OR IGNORE INTO library_snapshots(library) VALUES(?)", (library,))
+                if full:
+                    expiration_date = datetime.now() - timedelta(days=expiration)
+                    cursor.execute("UPDATE library_snapshots SET snapshot_at = ?, expiration_date = ? WHERE library = ?", (snapshot_at, expiration_date.strftime("%Y-%m-%d"), library))
+                else:
+                    cursor.execute("UPDATE library_snapshots SET snapshot_at = ? WHERE library = ?", (snapshot_at, library))
+
+    def query_http_cache(self, cache_key):
+        content = None
+        etag = None
+        last_modified = None
+        expired = None
+        with sqlite3.connect(self.cache_path) as connection:
+            connection.row_factory = sqlite3.Row
+            with closing(connection.cursor()) as cursor:
+                cursor.execute("SELECT * FROM http_cache WHERE cache_key = ?", (cache_key,))
+                row = cursor.fetchone()
+                if row and row["content"]:
+                    content = row["content"]
+                    etag = row["etag"]
+                    last_modified = row["last_modified"]
+                    expired = datetime.now() > datetime.strptime(row["expiration_date"], "%Y-%m-%d %H:%M:%S")
+        return content, etag, last_modified, expired
+
+    def update_http_cache(self, cache_key, url, content, etag, last_modified, expiration):
+        expiration_date = datetime.now() + timedelta(hours=expiration)
+        with sqlite3.connect(self.cache_path) as connection:
+            connection.row_factory = sqlite3.Row
+            with closing(connection.cursor()) as cursor:
+                cursor.execute("INSERT OR IGNORE INTO http_cache(cache_key) VALUES(?)", (cache_key,))
+                cursor.execute("UPDATE http_cache SET url = ?, content = ?, etag = ?, last_modified = ?, expiration_date = ? WHERE cache_key = ?",
+                               (url, content, etag, last_modified, expiration_date.strftime("%Y-%m-%d %H:%M:%S"), cache_key))
+
     def query_imdb_parental(self, imdb_id, expiration):
         imdb_dict = {}
         expired = None
@@ -1,6 +1,7 @@
-import base64, os, requests
+import base64, hashlib, json, os
 from datetime import datetime
 from lxml import html
+from urllib import parse
 from modules import util, radarr, sonarr, operations
 from modules.anidb import AniDB
 from modules.anilist import AniList
@@ -20,6 +21,7 @@ from modules.overlays import Overlays
 from modules.plex import Plex
 from modules.radarr import Radarr
 from modules.sonarr import Sonarr
+from modules.session import Session
 from modules.reciperr import Reciperr
 from modules.mdblist import Mdblist
 from modules.tautulli import Tautulli
@@ -28,14 +30,15 @@ from modules.trakt import Trakt
 from modules.tvdb import TVDb
 from modules.util import Failed, NotScheduled, NotScheduledRange, YAML
 from modules.webhooks import Webhooks
-from retrying import retry
 
 logger = util.logger
 
+response_cache_hours = {"imdb.com": 1, "letterboxd.com": 1, "icheckmovies.com": 6, "flixpatrol.com": 1, "thetvdb.com": 24}
 sync_modes = {"append": "Only Add Items to the Collection or Playlist", "sync": "Add & Remove Items from the Collection or Playlist"}
 mass_genre_options = {"tmdb": "Use TMDb Metadata", "imdb": "Use IMDb Rating", "omdb": "Use IMDb Metadata through OMDb", "tvdb": "Use TVDb Metadata", "anidb": "Use AniDB Tag Metadata"}
 mass_content_options = {"omdb": "Use IMDb Metadata through OMDb", "mdb": "Use MdbList Metadata", "mdb_commonsense": "Use Commonsense Rating through MDbList"}
 mass_available_options = {"tmdb": "Use TMDb Metadata", "omdb": "Use IMDb Metadata through OMDb", "mdb": "Use MdbList Metadata", "tvdb": "Use TVDb Metadata", "anidb": "Use AniDB Metadata"}
+report_formats = {"yml": "YAML Report rewritten once per library run", "jsonl": "JSON Lines Report appended as records are added"}
 imdb_label_options = {"with_none": "Add IMDb Parental Labels including None", "without_none": "Add IMDb Parental Labels including None"}
 mass_episode_rating_options = {"tmdb": "Use TMDb Rating", "imdb": "Use IMDb Rating"}
 mass_rating_options = {
@@ -322,6 +325,9 @@ class ConfigFile:
             "playlist_sync_to_users": check_for_attribute(self.data, "playlist_sync_to_users", parent="settings", default="all", default_is_none=True),
             "playlist_report": check_for_attribute(self.data, "playlist_report", parent="settings", var_type="bool", default=True),
             "verify_ssl": check_for_attribute(self.data, "verify_ssl", parent="settings", var_type="bool", default=True),
+            "max_workers": check_for_attribute(self.data, "max_workers", parent="settings", var_type="int", default=1, int_min=1),
+            "max_plex_writes": check_for_attribute(self.data, "max_plex_writes", parent="settings", var_type="int", default=1, int_min=1),
+            "imdb_requests_per_second": check_for_attribute(self.data, "imdb_requests_per_second", parent="settings", var_type="int", default=2, int_min=1),
             "custom_repo": check_for_attribute(self.data, "custom_repo", parent="settings", default_is_none=True),
             "check_nightly": check_for_attribute(self.data, "check_nightly", parent="settings", var_type="bool", default=False),
             "assets_for_all": check_for_attribute(self.data, "assets_for_all", parent="settings", var_type="bool", default=False, save=False, do_print=False)
@@ -335,7 +341,7 @@ class ConfigFile:
         self.check_nightly = self.general["check_nightly"]
         self.latest_version = util.current_version(self.version, nightly=self.check_nightly)
 
-        self.session = requests.Session()
+        self.session = Session(max_workers=self.general["max_workers"], rate_overrides={"imdb.com": self.general["imdb_requests_per_second"]})
         if not self.general["verify_ssl"]:
             self.session.verify = False
             if self.session.verify is False:
@@ -472,7 +478,11 @@ class ConfigFile:
             else:
                 logger.warning("mal attribute not found")
 
-            self.AniDB = AniDB(self, check_for_attribute(self.data, "language", parent="anidb", default="en"))
+            self.AniDB = AniDB(
+                self,
+                check_for_attribute(self.data, "language", parent="anidb", default="en"),
+                check_for_attribute(self.data, "cache_expiration", parent="anidb", var_type="int", default=60, int_min=1)
+            )
             if "anidb" in self.data:
                 logger.separator()
                 logger.info("Connecting to AniDB...")
@@ -590,6 +600,7 @@ class ConfigFile:
                     "mass_originally_available_update": None,
                     "mass_imdb_parental_labels": None,
                     "remove_title_parentheses": None,
+                    "operations_dry_run": False,
                     "mass_user_rating_update": None,
                     "mass_episode_audience_rating_update": None,
                     "mass_episode_critic_rating_update": None,
@@ -641,6 +652,7 @@ class ConfigFile:
                 params["split_duplicates"] = check_for_attribute(lib, "split_duplicates", var_type="bool", default=False, save=False, do_print=False)
                 params["radarr_add_all_existing"] = check_for_attribute(lib, "radarr_add_all_existing", var_type="bool", default=False, save=False, do_print=False)
                 params["sonarr_add_all_existing"] = check_for_attribute(lib, "sonarr_add_all_existing", var_type="bool", default=False, save=False, do_print=False)
+                params["report_format"] = check_for_attribute(lib, "report_format", test_list=report_formats, default="yml", do_print=False, save=False)
                 params["report_path"] = None
                 if lib and "report_path" in lib and lib["report_path"]:
                     if os.path.exists(os.path.dirname(os.path.abspath(lib["report_path"]))):
@@ -692,6 +704,8 @@ class ConfigFile:
                             params["update_blank_track_titles"] = check_for_attribute(lib["operations"], "update_blank_track_titles", var_type="bool", default=False, save=False)
                         if "remove_title_parentheses" in lib["operations"]:
                             params["remove_title_parentheses"] = check_for_attribute(lib["operations"], "remove_title_parentheses", var_type="bool", default=False, save=False)
+                        if "operations_dry_run" in lib["operations"]:
+                            params["operations_dry_run"] = check_for_attribute(lib["operations"], "operations_dry_run", var_type="bool", default=False, save=False)
                         if "mass_collection_mode" in lib["operations"]:
                             try:
                                 params["mass_collection_mode"] = util.check_collection_mode(lib["operations"]["mass_collection_mode"])
@@ -964,13 +978,43 @@ class ConfigFile:
                 logger.stacktrace()
                 logger.error(f"Webhooks Error: {e}")
 
-    def get_html(self, url, headers=None, params=None):
+    def get_html(self, url, headers=None, params=None, cache=False):
+        if cache:
+            return html.fromstring(self.get_cached(url, headers=headers, params=params))
         return html.fromstring(self.get(url, headers=headers, params=params).content)
 
+    def get_cached(self, url, headers=None, params=None):
+        host = parse.urlparse(url).hostname or ""
+        expiration = next((e for h, e in response_cache_hours.items() if host == h or host.endswith(f".{h}")), None)
+        if not self.Cache or expiration is None:
+            return self.get(url, headers=headers, params=params).content
+        cache_key = hashlib.sha256(json.dumps([url, params, headers], sort_keys=True, default=str).encode("utf-8")).hexdigest()
+        content, etag, last_modified, expired = self.Cache.query_http_cache(cache_key)
+        if content and expired is False:
+            return content
+        request_headers = dict(headers) if headers else {}
+        if content and etag:
+            request_headers["If-None-Match"] = etag
+        if content and last_modified:
+            request_headers["If-Modified-Since"] = last_modified
+        response = self.get(url, headers=request_headers, params=params)
+        if response.status_code == 304 and content:
+            logger.trace(f"Not Modified: {url}")
+        elif response.status_code == 200:
+            content = response.content
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+        elif content:
+            logger.warning(f"Cache Warning: Refreshing {url} failed ({response.status_code}) using the cached response")
+            return content
+        else:
+            return response.content
+        self.Cache.update_http_cache(cache_key, url, content, etag, last_modified, expiration)
+        return content
+
     def get_json(self, url, json=None, headers=None, params=None):
         return self.get(url, json=json, headers=headers, params=params).json()
 
-    @retry(stop_max_attempt_number=6, wait_fixed=10000)
     def get(self, url, json=None, headers=None, params=None):
         return self.session.get(url, json=json, headers=headers, params=params)
 
@@ -983,6 +1027,5 @@ class ConfigFile:
     def post_json(self, url, data=None, json=None, headers=None):
         return self.post(url, data=data, json=json, headers=headers).json()
 
-    @retry(stop_max_attempt_number=6, wait_fixed=10000)
     def post(self, url, data=None, json=None, headers=None):
         return self.session.post(url, data=data, json=json, headers=headers)
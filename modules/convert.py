@@ -1,4 +1,4 @@
-import re, requests
+import re, requests, threading
 from modules import util
 from modules.util import Failed, NonExisting
 from plexapi.exceptions import BadRequest
@@ -10,41 +10,81 @@ anime_lists_url = "https://raw.githubusercontent.com/meisnate12/Plex-Meta-Manage
 class Convert:
     def __init__(self, config):
         self.config = config
-        self._anidb_ids = {}
+        self._loaded = False
+        self._load_lock = threading.Lock()
+        self._anidb_ids = set()
         self._mal_to_anidb = {}
         self._anilist_to_anidb = {}
         self._anidb_to_imdb = {}
         self._anidb_to_tvdb = {}
         self._imdb_to_anidb = {}
         self._tvdb_to_anidb = {}
-        self._anidb_ids = self.config.get_json(anime_lists_url)
-        for anidb_id, ids in self._anidb_ids.items():
-            anidb_id = int(anidb_id)
-            if "mal_id" in ids:
-                self._mal_to_anidb[int(ids["mal_id"])] = anidb_id
-            if "anilist_id" in ids:
-                self._anilist_to_anidb[int(ids["anilist_id"])] = anidb_id
-            if "imdb_id" in ids and str(ids["imdb_id"]).startswith("tt"):
-                self._anidb_to_imdb[anidb_id] = util.get_list(ids["imdb_id"])
-                for im_id in util.get_list(ids["imdb_id"]):
+
+    def load_anime_ids(self):
+        if self._loaded:
+            return
+        with self._load_lock:
+            if not self._loaded:
+                self._load_anime_ids()
+                self._loaded = True
+
+    def _load_anime_ids(self):
+        etag = None
+        anime_ids = []
+        if self.config.Cache:
+            etag, anime_ids = self.config.Cache.query_anime_ids(anime_lists_url)
+        try:
+            response = self.config.get(anime_lists_url, headers={"If-None-Match": etag} if etag and anime_ids else None)
+            if response.status_code == 304:
+                logger.debug("Anime IDs: Using cached list")
+            else:
+                anime_ids = []
+                for anidb_id, ids in response.json().items():
+                    anime_ids.append((
+                        int(anidb_id),
+                        int(ids["mal_id"]) if "mal_id" in ids else None,
+                        int(ids["anilist_id"]) if "anilist_id" in ids else None,
+                        str(ids["imdb_id"]) if "imdb_id" in ids else None,
+                        int(ids["tvdb_id"]) if "tvdb_id" in ids else None
+                    ))
+                if self.config.Cache:
+                    self.config.Cache.update_anime_ids(anime_lists_url, response.headers.get("ETag"), anime_ids)
+        except Exception:
+            logger.stacktrace()
+            if anime_ids:
+                logger.error("Convert Error: Failed to update the Anime IDs list using cached list")
+            else:
+                logger.error("Convert Error: Failed to load the Anime IDs list")
+        for anidb_id, mal_id, anilist_id, imdb_id, tvdb_id in anime_ids:
+            self._anidb_ids.add(anidb_id)
+            if mal_id:
+                self._mal_to_anidb[mal_id] = anidb_id
+            if anilist_id:
+                self._anilist_to_anidb[anilist_id] = anidb_id
+            if imdb_id and imdb_id.startswith("tt"):
+                self._anidb_to_imdb[anidb_id] = util.get_list(imdb_id)
+                for im_id in util.get_list(imdb_id):
                     self._imdb_to_anidb[im_id] = anidb_id
-            if "tvdb_id" in ids:
-                self._anidb_to_tvdb[anidb_id] = int(ids["tvdb_id"])
-                self._tvdb_to_anidb[int(ids["tvdb_id"])] = anidb_id
+            if tvdb_id:
+                self._anidb_to_tvdb[anidb_id] = tvdb_id
+                self._tvdb_to_anidb[tvdb_id] = anidb_id
 
     def imdb_to_anidb(self, imdb_id):
+        self.load_anime_ids()
         if imdb_id in self._imdb_to_anidb:
             return self._imdb_to_anidb[imdb_id]
         else:
             raise Failed(f"AniDB ID not found for IMDb ID: {imdb_id}")
 
     def tvdb_to_anidb(self, tvdb_id):
+        self.load_anime_ids()
         if int(tvdb_id) in self._tvdb_to_anidb:
             return self._tvdb_to_anidb[int(tvdb_id)]
         else:
             raise Failed(f"AniDB ID not found for TVDb ID: {tvdb_id}")
 
     def anidb_to_ids(self, anidb_ids, library):
+        self.load_anime_ids()
         ids = []
         anidb_list = anidb_ids if isinstance(anidb_ids, list) else [anidb_ids]
         for anidb_id in anidb_list:
@@ -61,13 +101,14 @@ class Convert:
                     ids.append((self._anidb_to_tvdb[anidb_id], "tvdb"))
             elif anidb_id in self._anidb_to_tvdb:
                 ids.append((self._anidb_to_tvdb[anidb_id], "tvdb"))
-            elif str(anidb_id) in self._anidb_ids:
+            elif anidb_id in self._anidb_ids:
                 logger.warning(f"Convert Error: No TVDb ID or IMDb ID found for AniDB ID: {anidb_id}")
             else:
                 logger.warning(f"Convert Error: AniDB ID: {anidb_id} not found")
         return ids
 
     def anilist_to_ids(self, anilist_ids, library):
+        self.load_anime_ids()
         anidb_ids = []
         for anilist_id in anilist_ids:
             if anilist_id in self._anilist_to_anidb:
@@ -77,6 +118,7 @@ class Convert:
         return self.anidb_to_ids(anidb_ids, library)
 
     def myanimelist_to_ids(self, mal_ids, library):
+        self.load_anime_ids()
         ids = []
         for mal_id in mal_ids:
             if int(mal_id) in library.mal_map:
@@ -204,13 +246,13 @@ class Convert:
         else:
             return None
 
-    def ids_from_cache(self, ratingKey, guid, item_type, check_id, library):
+    def ids_from_cache(self, ratingKey, guid, item_type, check_id, library, cache_data=None):
         media_id_type = None
         cache_id = None
         imdb_check = None
         expired = None
         if self.config.Cache:
-            cache_id, imdb_check, media_type, expired = self.config.Cache.query_guid_map(guid)
+            cache_id, imdb_check, media_type, expired = cache_data if cache_data else self.config.Cache.query_guid_map(guid)
             if (cache_id or imdb_check) and not expired:
                 media_id_type = "movie" if "movie" in media_type else "show"
                 if item_type == "hama" and check_id.startswith("anidb"):
@@ -224,14 +266,14 @@ class Convert:
         guid = requests.utils.urlparse(guid_str)
         return guid.scheme.split(".")[-1], guid.netloc
 
-    def get_id(self, item, library):
+    def get_id(self, item, library, cache_data=None):
         expired = None
         tmdb_id = []
         tvdb_id = []
         imdb_id = []
         anidb_id = None
         item_type, check_id = self.scan_guid(item.guid)
-        media_id_type, cache_id, imdb_check, expired = self.ids_from_cache(item.ratingKey, item.guid, item_type, check_id, library)
+        media_id_type, cache_id, imdb_check, expired = self.ids_from_cache(item.ratingKey, item.guid, item_type, check_id, library, cache_data=cache_data)
         if (cache_id or imdb_check) and expired is False:
             return media_id_type, cache_id, imdb_check
         try:
@@ -273,6 +315,7 @@ class Convert:
                     raise Failed(f"Hama Agent ID: {check_id} not supported")
             elif item_type == "myanimelist":
                 library.mal_map[int(check_id)] = item.ratingKey
+                self.load_anime_ids()
                 if int(check_id) in self._mal_to_anidb:
                     anidb_id = self._mal_to_anidb[int(check_id)]
                 else:
@@ -281,6 +324,7 @@ class Convert:
             else:                                           raise NonExisting(f"Agent {item_type} not supported")
 
             if anidb_id:
+                self.load_anime_ids()
                 if anidb_id in self._anidb_to_imdb:
                     added = False
                     for imdb in self._anidb_to_imdb[anidb_id]:
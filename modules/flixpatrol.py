@@ -1,3 +1,5 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
 from modules import util
 from modules.util import Failed
 
@@ -38,10 +40,11 @@ urls = {
 class FlixPatrol:
     def __init__(self, config):
         self.config = config
+        self._lists = {}
 
     def _request(self, url, language, xpath):
         logger.trace(f"URL: {url}")
-        return self.config.get_html(url, headers=util.header(language)).xpath(xpath)
+        return self.config.get_html(url, headers=util.header(language), cache=True).xpath(xpath)
 
     def _tmdb(self, flixpatrol_url, language):
         ids = self._request(flixpatrol_url, language, "//script[@type='application/ld+json']/text()")
@@ -51,6 +54,10 @@ class FlixPatrol:
         raise Failed(f"FlixPatrol Error: TMDb Movie ID not found at {flixpatrol_url}")
 
     def _parse_list(self, list_url, language, is_movie, limit=0):
+        if (list_url, language, is_movie) in self._lists:
+            flixpatrol_urls, fetched = self._lists[(list_url, language, is_movie)]
+            logger.trace(f"Using {list_url} fetched at {fetched.strftime('%H:%M:%S')}")
+            return flixpatrol_urls if limit == 0 else flixpatrol_urls[:limit]
         flixpatrol_urls = []
         if list_url.startswith(urls["top10"]):
             platform = list_url[len(urls["top10"]):].split("/")[0]
@@ -70,7 +77,8 @@ class FlixPatrol:
                 list_url, language,
                 f"//a[contains(@class, 'flex group') and .//span[.='{'Movie' if is_movie else 'TV Show'}']]/@href"
             )
-        return flixpatrol_urls if limit == 0  else flixpatrol_urls[:limit]
+        self._lists[(list_url, language, is_movie)] = (flixpatrol_urls, datetime.now())
+        return flixpatrol_urls if limit == 0 else flixpatrol_urls[:limit]
 
     def validate_flixpatrol_lists(self, flixpatrol_lists, language, is_movie):
         valid_lists = []
@@ -134,22 +142,25 @@ class FlixPatrol:
         media_type = "movie" if is_movie else "show"
         total_items = len(items)
         if total_items > 0:
-            ids = []
-            for i, item in enumerate(items, 1):
-                logger.ghost(f"Finding TMDb ID {i}/{total_items}")
-                tmdb_id = None
-                expired = None
-                if self.config.Cache:
-                    tmdb_id, expired = self.config.Cache.query_flixpatrol_map(item, media_type)
-                if not tmdb_id or expired is not False:
-                    try:
-                        tmdb_id = self._tmdb(f"{base_url}{item}", language)
-                    except Failed as e:
-                        logger.error(e)
-                        continue
-                    if self.config.Cache:
-                        self.config.Cache.update_flixpatrol_map(expired, item, tmdb_id, media_type)
-                ids.append((tmdb_id, "tmdb" if is_movie else "tmdb_show"))
+            cache_maps = self.config.Cache.query_flixpatrol_maps(items, media_type) if self.config.Cache else {}
+            tmdb_ids = {k: tmdb_id for k, (tmdb_id, expired) in cache_maps.items() if expired is False}
+            missing = [item for item in items if item not in tmdb_ids]
+            if missing:
+                cache_updates = []
+                with ThreadPoolExecutor(max_workers=self.config.general["max_workers"]) as executor:
+                    futures = {executor.submit(self._tmdb, f"{base_url}{item}", language): item for item in missing}
+                    for i, future in enumerate(as_completed(futures), 1):
+                        logger.ghost(f"Finding TMDb ID {i}/{len(missing)}")
+                        item = futures[future]
+                        try:
+                            tmdb_ids[item] = future.result()
+                        except Failed as e:
+                            logger.error(e)
+                            continue
+                        cache_updates.append((item, tmdb_ids[item], cache_maps[item][1] if item in cache_maps else None))
+                if self.config.Cache and cache_updates:
+                    self.config.Cache.update_flixpatrol_maps(cache_updates, media_type)
+            ids = [(tmdb_ids[item], "tmdb" if is_movie else "tmdb_show") for item in items if item in tmdb_ids]
             logger.info(f"Processed {total_items} TMDb IDs")
             return ids
         else:
@@ -1,3 +1,4 @@
+from datetime import datetime
 from modules import util
 from modules.util import Failed
 
@@ -9,14 +10,21 @@ base_url = "https://www.icheckmovies.com/lists/"
 class ICheckMovies:
     def __init__(self, config):
         self.config = config
+        self._lists = {}
 
     def _request(self, url, language, xpath):
         logger.trace(f"URL: {url}")
-        return self.config.get_html(url, headers=util.header(language)).xpath(xpath)
+        return self.config.get_html(url, headers=util.header(language), cache=True).xpath(xpath)
 
     def _parse_list(self, list_url, language):
+        if (list_url, language) in self._lists:
+            ids, fetched = self._lists[(list_url, language)]
+            logger.trace(f"Using {list_url} fetched at {fetched.strftime('%H:%M:%S')}")
+            return ids
         imdb_urls = self._request(list_url, language, "//a[@class='optionIcon optionIMDB external']/@href")
-        return [(t[t.find("/tt") + 1:-1], "imdb") for t in imdb_urls]
+        ids = [(t[t.find("/tt") + 1:-1], "imdb") for t in imdb_urls]
+        self._lists[(list_url, language)] = (ids, datetime.now())
+        return ids
 
     def get_list_description(self, list_url, language):
         descriptions = self._request(list_url, language, "//div[@class='span-19 last']/p/em/text()")
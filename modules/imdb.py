@@ -1,4 +1,6 @@
-import csv, gzip, json, math, os, re, requests, shutil, time
+import csv, gzip, json, math, os, re, shutil, threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
 from modules import util
 from modules.util import Failed
 from urllib.parse import urlparse, parse_qs
@@ -33,6 +35,8 @@ class IMDb:
         self._ratings = None
         self._genres = None
         self._episode_ratings = None
+        self._interface_lock = threading.RLock()
+        self._totals = {}
 
     def validate_imdb_lists(self, err_type, imdb_lists, language):
         valid_lists = []
@@ -84,11 +88,15 @@ class IMDb:
         return valid_users
 
     def _watchlist(self, user, language):
-        response = self.config.get_html(f"{base_url}/user/{user}/watchlist", headers=util.header(language))
+        response = self.config.get_html(f"{base_url}/user/{user}/watchlist", headers=util.header(language), cache=True)
         group = response.xpath("//span[@class='ab_widget']/script[@type='text/javascript']/text()")
         return [k for k in json.loads(str(group[0]).split("\n")[5][35:-2])["titles"]]
 
     def _total(self, imdb_url, language):
+        if (imdb_url, language) in self._totals:
+            total, per_page, fetched = self._totals[(imdb_url, language)]
+            logger.trace(f"Using {imdb_url} fetched at {fetched.strftime('%H:%M:%S')}")
+            return total, per_page
         if imdb_url.startswith(urls["lists"]):
             xpath_total = "//div[@class='desc lister-total-num-results']/text()"
             per_page = 100
@@ -101,7 +109,7 @@ class IMDb:
         else:
             xpath_total = "//div[@class='desc']/text()"
             per_page = 50
-        results = self.config.get_html(imdb_url, headers=util.header(language)).xpath(xpath_total)
+        results = self.config.get_html(imdb_url, headers=util.header(language), cache=True).xpath(xpath_total)
         total = 0
         for result in results:
             if "title" in result:
@@ -111,6 +119,7 @@ class IMDb:
                 except IndexError:
                     pass
         if total > 0:
+            self._totals[(imdb_url, language)] = (total, per_page, datetime.now())
             return total, per_page
         raise Failed(f"IMDb Error: Failed to parse URL: {imdb_url}")
 
@@ -133,22 +142,30 @@ class IMDb:
         if remainder == 0:
             remainder = item_count
         num_of_pages = math.ceil(int(limit) / item_count)
-        for i in range(1, num_of_pages + 1):
-            start_num = (i - 1) * item_count + 1
-            logger.ghost(f"Parsing Page {i}/{num_of_pages} {start_num}-{limit if i == num_of_pages else i * item_count}")
+
+        def get_page(page_num):
+            page_params = params.copy()
             if search_url:
-                params["count"] = remainder if i == num_of_pages else item_count # noqa
-                params["start"] = start_num # noqa
+                page_params["count"] = remainder if page_num == num_of_pages else item_count # noqa
+                page_params["start"] = (page_num - 1) * item_count + 1 # noqa
             elif imdb_base.startswith(urls["title_text_searches"]):
-                params["start"] = start_num # noqa
+                page_params["start"] = (page_num - 1) * item_count + 1 # noqa
             else:
-                params["page"] = i # noqa
-            response = self.config.get_html(imdb_base, headers=headers, params=params)
+                page_params["page"] = page_num # noqa
+            response = self.config.get_html(imdb_base, headers=headers, params=page_params, cache=True)
             ids_found = response.xpath("//div[contains(@class, 'lister-item-image')]//a/img//@data-tconst")
-            if not search_url and i == num_of_pages:
+            if not search_url and page_num == num_of_pages:
                 ids_found = ids_found[:remainder]
-            imdb_ids.extend(ids_found)
-            time.sleep(2)
+            return ids_found
+
+        pages = {}
+        with ThreadPoolExecutor(max_workers=self.config.general["max_workers"]) as executor:
+            futures = {executor.submit(get_page, i): i for i in range(1, num_of_pages + 1)}
+            for i, future in enumerate(as_completed(futures), 1):
+                logger.ghost(f"Parsing Page {i}/{num_of_pages}")
+                pages[futures[future]] = future.result()
+        for i in range(1, num_of_pages + 1):
+            imdb_ids.extend(pages[i])
         logger.exorcise()
         if len(imdb_ids) > 0:
             logger.debug(f"{len(imdb_ids)} IMDb IDs Found: {imdb_ids}")
@@ -192,7 +209,7 @@ class IMDb:
             url = "chart/bottom"
         else:
             raise Failed(f"IMDb Error: chart: {chart} not ")
-        return self.config.get_html(f"https://www.imdb.com/{url}").xpath("//div[@class='wlb_ribbon']/@data-tconst")
+        return self.config.get_html(f"https://www.imdb.com/{url}", cache=True).xpath("//div[@class='wlb_ribbon']/@data-tconst")
 
     def get_imdb_ids(self, method, data, language):
         if method == "imdb_id":
@@ -220,7 +237,7 @@ class IMDb:
         if os.path.exists(tsv):
             os.remove(tsv)
 
-        with requests.get(f"https://datasets.imdbws.com/title.{interface}.tsv.gz", stream=True) as r:
+        with self.config.session.get(f"https://datasets.imdbws.com/title.{interface}.tsv.gz", stream=True) as r:
             r.raise_for_status()
             total_length = r.headers.get('content-length')
             if total_length is not None:
@@ -255,27 +272,34 @@ class IMDb:
     @property
     def ratings(self):
         if self._ratings is None:
-            self._ratings = self._interface("ratings")
+            with self._interface_lock:
+                if self._ratings is None:
+                    self._ratings = self._interface("ratings")
         return self._ratings
 
     @property
     def genres(self):
         if self._genres is None:
-            self._genres = self._interface("basics")
+            with self._interface_lock:
+                if self._genres is None:
+                    self._genres = self._interface("basics")
         return self._genres
 
     @property
     def episode_ratings(self):
         if self._episode_ratings is None:
-            self._episode_ratings = {}
-            for imdb_id, parent_id, season_num, episode_num in self._interface("episode"):
-                if imdb_id not in self.ratings:
-                    continue
-                if parent_id not in self._episode_ratings:
-                    self._episode_ratings[parent_id] = {}
-                if season_num not in self._episode_ratings[parent_id]:
-                    self._episode_ratings[parent_id][season_num] = {}
-                self._episode_ratings[parent_id][season_num][episode_num] = self.ratings[imdb_id]
+            with self._interface_lock:
+                if self._episode_ratings is None:
+                    episode_ratings = {}
+                    for imdb_id, parent_id, season_num, episode_num in self._interface("episode"):
+                        if imdb_id not in self.ratings:
+                            continue
+                        if parent_id not in episode_ratings:
+                            episode_ratings[parent_id] = {}
+                        if season_num not in episode_ratings[parent_id]:
+                            episode_ratings[parent_id][season_num] = {}
+                        episode_ratings[parent_id][season_num][episode_num] = self.ratings[imdb_id]
+                    self._episode_ratings = episode_ratings
         return self._episode_ratings
 
     def get_rating(self, imdb_id):
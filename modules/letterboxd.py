@@ -1,4 +1,5 @@
-import re, time
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from modules import util
 from modules.util import Failed
 
@@ -11,35 +12,44 @@ class Letterboxd:
     def __init__(self, config):
         self.config = config
 
-    def _parse_page(self, list_url, language):
+    def _request(self, list_url, language):
         if "ajax" not in list_url:
             list_url = list_url.replace("https://letterboxd.com/films", "https://letterboxd.com/films/ajax")
         logger.trace(f"URL: {list_url}")
-        response = self.config.get_html(list_url, headers=util.header(language))
-        letterboxd_ids = response.xpath("//li[contains(@class, 'poster-container') or contains(@class, 'film-detail')]/div/@data-film-id")
+        return self.config.get_html(list_url, headers=util.header(language), cache=True)
+
+    def _parse_page(self, response):
         items = []
-        for letterboxd_id in letterboxd_ids:
-            slugs = response.xpath(f"//div[@data-film-id='{letterboxd_id}']/@data-film-slug")
-            comments = response.xpath(f"//div[@data-film-id='{letterboxd_id}']/parent::li/div[@class='film-detail-content']/div/p/text()")
-            ratings = response.xpath(f"//div[@data-film-id='{letterboxd_id}']/parent::li/div[@class='film-detail-content']//span[contains(@class, 'rating')]/@class")
-            years = response.xpath(f"//div[@data-film-id='{letterboxd_id}']/parent::li/div[@class='film-detail-content']/h2/small/a/text()")
+        for film in response.xpath("//li[contains(@class, 'poster-container') or contains(@class, 'film-detail')]"):
+            film_divs = film.xpath("div[@data-film-id]")
+            if not film_divs:
+                continue
+            details = film.xpath("div[@class='film-detail-content']")
+            comments = details[0].xpath("div/p/text()") if details else []
+            ratings = details[0].xpath(".//span[contains(@class, 'rating')]/@class") if details else []
+            years = details[0].xpath("h2/small/a/text()") if details else []
             rating = None
             if ratings:
                 match = re.search("rated-(\\d+)", ratings[0])
                 if match:
                     rating = int(match.group(1))
-            items.append((letterboxd_id, slugs[0], int(years[0]) if years else None, comments[0] if comments else None, rating))
-        next_url = response.xpath("//a[@class='next']/@href")
-        return items, next_url
+            for film_div in film_divs:
+                items.append((film_div.get("data-film-id"), film_div.get("data-film-slug"), int(years[0]) if years else None, comments[0] if comments else None, rating))
+        return items
 
     def _parse_list(self, list_url, limit, language):
-        items, next_url = self._parse_page(list_url, language)
-        while len(next_url) > 0:
-            time.sleep(2)
-            new_items, next_url = self._parse_page(f"{base_url}{next_url[0]}", language)
-            items.extend(new_items)
-            if limit and len(items) >= limit:
-                return items[:limit]
+        items = []
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(self._request, list_url, language)
+            while future:
+                response = future.result()
+                next_url = response.xpath("//a[@class='next']/@href")
+                future = executor.submit(self._request, f"{base_url}{next_url[0]}", language) if next_url else None
+                items.extend(self._parse_page(response))
+                if limit and len(items) >= limit:
+                    if future:
+                        future.cancel()
+                    return items[:limit]
         return items
 
     def _tmdb(self, letterboxd_url, language):
@@ -54,7 +64,7 @@ class Letterboxd:
 
     def get_list_description(self, list_url, language):
         logger.trace(f"URL: {list_url}")
-        response = self.config.get_html(list_url, headers=util.header(language))
+        response = self.config.get_html(list_url, headers=util.header(language), cache=True)
         descriptions = response.xpath("//meta[@property='og:description']/@content")
         return descriptions[0] if len(descriptions) > 0 and len(descriptions[0]) > 0 else None
 
@@ -73,7 +83,7 @@ class Letterboxd:
             }
             if not final["url"].startswith(base_url):
                 raise Failed(f"{err_type} Error: {final['url']} must begin with: {base_url}")
-            elif not self._parse_page(final["url"], language)[0]:
+            elif not self._parse_page(self._request(final["url"], language)):
                 raise Failed(f"{err_type} Error: {final['url']} failed to parse")
             valid_lists.append(final)
         return valid_lists
@@ -84,10 +94,9 @@ class Letterboxd:
             items = self._parse_list(data["url"], data["limit"], language)
             total_items = len(items)
             if total_items > 0:
-                ids = []
                 filtered_ids = []
-                for i, item in enumerate(items, 1):
-                    letterboxd_id, slug, year, note, rating = item
+                film_ids = []
+                for letterboxd_id, slug, year, note, rating in items:
                     filtered = False
                     if data["year"]:
                         start_year, end_year = data["year"].split("-")
@@ -102,21 +111,27 @@ class Letterboxd:
                             filtered = True
                     if filtered:
                         filtered_ids.append(slug)
-                        continue
-                    logger.ghost(f"Finding TMDb ID {i}/{total_items}")
-                    tmdb_id = None
-                    expired = None
-                    if self.config.Cache:
-                        tmdb_id, expired = self.config.Cache.query_letterboxd_map(letterboxd_id)
-                    if not tmdb_id or expired is not False:
-                        try:
-                            tmdb_id = self._tmdb(f"{base_url}{slug}", language)
-                        except Failed as e:
-                            logger.error(e)
-                            continue
-                        if self.config.Cache:
-                            self.config.Cache.update_letterboxd_map(expired, letterboxd_id, tmdb_id)
-                    ids.append((tmdb_id, "tmdb"))
+                    else:
+                        film_ids.append((letterboxd_id, slug))
+                cache_maps = self.config.Cache.query_letterboxd_maps([f[0] for f in film_ids]) if self.config.Cache else {}
+                tmdb_ids = {k: tmdb_id for k, (tmdb_id, expired) in cache_maps.items() if expired is False}
+                missing = [(k, slug) for k, slug in film_ids if k not in tmdb_ids]
+                if missing:
+                    cache_updates = []
+                    with ThreadPoolExecutor(max_workers=self.config.general["max_workers"]) as executor:
+                        futures = {executor.submit(self._tmdb, f"{base_url}{slug}", language): k for k, slug in missing}
+                        for i, future in enumerate(as_completed(futures), 1):
+                            logger.ghost(f"Finding TMDb ID {i}/{len(missing)}")
+                            letterboxd_id = futures[future]
+                            try:
+                                tmdb_ids[letterboxd_id] = future.result()
+                            except Failed as e:
+                                logger.error(e)
+                                continue
+                            cache_updates.append((letterboxd_id, tmdb_ids[letterboxd_id], cache_maps[letterboxd_id][1] if letterboxd_id in cache_maps else None))
+                    if self.config.Cache and cache_updates:
+                        self.config.Cache.update_letterboxd_maps(cache_updates)
+                ids = [(tmdb_ids[k], "tmdb") for k, _ in film_ids if k in tmdb_ids]
                 logger.info(f"Processed {total_items} TMDb IDs")
                 if filtered_ids:
                     logger.info(f"Filtered: {filtered_ids}")
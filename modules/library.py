@@ -1,5 +1,7 @@
-import os
+import json, os, threading
+from datetime import datetime
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from modules import util, operations
 from modules.meta import MetadataFile, OverlayFile
 from modules.operations import Operations
@@ -30,6 +32,7 @@ class Library(ABC):
         self.movie_rating_key_map = {}
         self.show_rating_key_map = {}
         self.cached_items = {}
+        self.write_semaphore = threading.BoundedSemaphore(config.general["max_plex_writes"])
         self.run_again = []
         self.overlays_old = []
         self.type = ""
@@ -46,8 +49,11 @@ class Library(ABC):
         self.image_table_name = self.config.Cache.get_image_table_name(self.original_mapping_name) if self.config.Cache else None
         self.overlay_folder = os.path.join(self.config.default_dir, "overlays")
         self.overlay_backup = os.path.join(self.overlay_folder, f"{self.mapping_name} Original Posters")
-        self.report_path = params["report_path"] if params["report_path"] else os.path.join(self.default_dir, f"{self.mapping_name}_report.yml")
+        self.report_format = params["report_format"]
+        self.report_path = params["report_path"] if params["report_path"] else os.path.join(self.default_dir, f"{self.mapping_name}_report.{self.report_format}")
         self.report_data = {}
+        self.report_changed = False
+        self.report_started = False
         self.asset_folders = params["asset_folders"]
         self.create_asset_folders = params["create_asset_folders"]
         self.dimensional_asset_rename = params["dimensional_asset_rename"]
@@ -91,6 +97,7 @@ class Library(ABC):
         self.sonarr_remove_by_tag = params["sonarr_remove_by_tag"]
         self.update_blank_track_titles = params["update_blank_track_titles"]
         self.remove_title_parentheses = params["remove_title_parentheses"]
+        self.operations_dry_run = params["operations_dry_run"]
         self.remove_overlays = params["remove_overlays"]
         self.reapply_overlays = params["reapply_overlays"]
         self.reset_overlays = params["reset_overlays"]
@@ -232,6 +239,14 @@ class Library(ABC):
     def get_all(self, builder_level=None, load=False):
         pass
 
+    @abstractmethod
+    def get_updated_items(self, updated_since):
+        pass
+
+    @abstractmethod
+    def item_count(self):
+        pass
+
     def add_additions(self, collection, items, is_movie):
         self._add_to_file("Added", collection, items, is_movie)
 
@@ -245,9 +260,17 @@ class Library(ABC):
         self._add_to_file("Filtered", collection, items, is_movie)
 
     def _add_to_file(self, file_type, collection, items, is_movie):
+        parts = isinstance(items[0], str)
+        if self.report_format == "jsonl":
+            media = "part" if parts else "movie" if is_movie else "show"
+            with open(self.report_path, "a" if self.report_started else "w", encoding="utf-8") as handle:
+                for item in items:
+                    title, item_id = (item, None) if parts else item
+                    handle.write(f"{json.dumps({'collection': collection, 'type': file_type, 'media': media, 'id': int(item_id) if item_id else None, 'title': title})}\n")
+            self.report_started = True
+            return
         if collection not in self.report_data:
             self.report_data[collection] = {}
-        parts = isinstance(items[0], str)
         if parts:
             other = f"Parts {file_type}"
             section = other
@@ -269,11 +292,19 @@ class Library(ABC):
                     if other not in self.report_data[collection]:
                         self.report_data[collection][other] = []
                     self.report_data[collection][other].append(title)
+        self.report_changed = True
+
+    def start_report_file(self):
+        if self.report_format == "jsonl" and not self.report_started and os.path.exists(self.report_path):
+            os.remove(self.report_path)
 
-        with open(self.report_path, "w"): pass
-        yaml = YAML(self.report_path)
-        yaml.data = self.report_data
-        yaml.save()
+    def save_report_file(self):
+        if self.report_changed:
+            with open(self.report_path, "w"): pass
+            yaml = YAML(self.report_path)
+            yaml.data = self.report_data
+            yaml.save()
+            self.report_changed = False
 
     def cache_items(self):
         logger.info("")
@@ -284,29 +315,86 @@ class Library(ABC):
             self.cached_items[item.ratingKey] = (item, False)
         return items
 
+    def load_snapshot(self):
+        snapshot_at = int(datetime.now().timestamp())
+        snapshot, last_snapshot, expired = self.config.Cache.query_library_snapshot(self.mapping_name, 1)
+        if snapshot and expired is False:
+            items = {s["rating_key"]: s for s in snapshot}
+            updated = self.get_updated_items(datetime.fromtimestamp(last_snapshot))
+            for item in updated:
+                items[item.ratingKey] = item
+                self.cached_items[item.ratingKey] = (item, False)
+            current_keys = self.get_rating_key_set()
+            items = {k: v for k, v in items.items() if k in current_keys}
+            if len(items) == len(current_keys):
+                logger.info(f"Library: {self.mapping_name} loaded from Cache with {len(updated)} Updated {self.type}{'' if len(updated) == 1 else 's'}")
+                return list(items.values()), snapshot_at
+            logger.info(f"Library: {self.mapping_name} Cache out of date")
+        return self.cache_items(), snapshot_at
+
+    def save_snapshot(self, items, results, snapshot_at):
+        snapshot_items = []
+        for item in items:
+            if not isinstance(item, dict):
+                id_type, main_id, imdb_id = results[item.ratingKey] if results and item.ratingKey in results and results[item.ratingKey] else (None, None, None)
+                snapshot_items.append((
+                    item.ratingKey, item.guid, id_type,
+                    ",".join([str(m) for m in main_id]) if id_type and main_id else None,
+                    ",".join(imdb_id) if id_type and imdb_id else None,
+                    item.title, item.year if hasattr(item, "year") else None,
+                    int(item.updatedAt.timestamp()) if item.updatedAt else None
+                ))
+        full = not any([isinstance(i, dict) for i in items])
+        self.config.Cache.update_library_snapshot(self.mapping_name, snapshot_at, snapshot_items, full, 1)
+
     def map_guids(self, items):
+        guid_maps = {}
+        if self.config.Cache:
+            guid_maps = self.config.Cache.query_guid_maps([i[1] if isinstance(i, tuple) else i.guid for i in items if not isinstance(i, dict)])
+        results = {}
+        misses = []
         for i, item in enumerate(items, 1):
             if isinstance(item, tuple):
                 logger.ghost(f"Processing: {i}/{len(items)}")
                 key, guid = item
+            elif isinstance(item, dict):
+                logger.ghost(f"Processing: {i}/{len(items)} {item['title']}")
+                key = item["rating_key"]
+                guid = item["guid"]
             else:
                 logger.ghost(f"Processing: {i}/{len(items)} {item.title}")
                 key = item.ratingKey
                 guid = item.guid
-            if key not in self.movie_rating_key_map and key not in self.show_rating_key_map:
-                if isinstance(item, tuple):
+            if key not in self.movie_rating_key_map and key not in self.show_rating_key_map and key not in results:
+                if isinstance(item, dict) and item["media_type"]:
+                    cache_data = (item["t_id"], item["imdb_id"], item["media_type"], False)
+                else:
+                    cache_data = guid_maps[guid] if guid in guid_maps else (None, None, None, None)
+                if isinstance(item, (tuple, dict)):
                     item_type, check_id = self.config.Convert.scan_guid(guid)
-                    id_type, main_id, imdb_id, _ = self.config.Convert.ids_from_cache(key, guid, item_type, check_id, self)
+                    id_type, main_id, imdb_id, _ = self.config.Convert.ids_from_cache(key, guid, item_type, check_id, self, cache_data=cache_data)
+                    results[key] = (id_type, main_id, imdb_id)
+                elif self.config.general["max_workers"] > 1 and (cache_data[3] is not False or not (cache_data[0] or cache_data[1])):
+                    results[key] = None
+                    misses.append((item, cache_data))
                 else:
-                    id_type, main_id, imdb_id = self.config.Convert.get_id(item, self)
-                if main_id:
-                    if id_type == "movie":
-                        self.movie_rating_key_map[key] = main_id[0]
-                        util.add_dict_list(main_id, key, self.movie_map)
-                    elif id_type == "show":
-                        self.show_rating_key_map[key] = main_id[0]
-                        util.add_dict_list(main_id, key, self.show_map)
-                if imdb_id:
-                    util.add_dict_list(imdb_id, key, self.imdb_map)
+                    results[key] = self.config.Convert.get_id(item, self, cache_data=cache_data)
+        if misses:
+            with ThreadPoolExecutor(max_workers=self.config.general["max_workers"]) as executor:
+                futures = {executor.submit(self.config.Convert.get_id, item, self, cache_data=cache_data): item.ratingKey for item, cache_data in misses}
+                for i, future in enumerate(as_completed(futures), 1):
+                    logger.ghost(f"Mapping: {i}/{len(misses)}")
+                    results[futures[future]] = future.result()
+        for key, (id_type, main_id, imdb_id) in results.items():
+            if main_id:
+                if id_type == "movie":
+                    self.movie_rating_key_map[key] = main_id[0]
+                    util.add_dict_list(main_id, key, self.movie_map)
+                elif id_type == "show":
+                    self.show_rating_key_map[key] = main_id[0]
+                    util.add_dict_list(main_id, key, self.show_map)
+            if imdb_id:
+                util.add_dict_list(imdb_id, key, self.imdb_map)
         logger.info("")
         logger.info(f"Processed {len(items)} {self.type}s")
+        return results
@@ -1,4 +1,4 @@
-import io, logging, os, re, sys, traceback
+import io, logging, os, re, sys, threading, traceback
 from logging.handlers import RotatingFileHandler
 
 LOG_DIR = "logs"
@@ -48,6 +48,7 @@ class MyLogger:
         self.playlists_handler = None
         self.secrets = []
         self.spacing = 0
+        self._local = threading.local()
         self.playlists_log = os.path.join(self.playlists_dir, PLAYLISTS_LOG)
         os.makedirs(self.log_dir, exist_ok=True)
         self._logger = logging.getLogger(self.logger_name)
@@ -209,7 +210,21 @@ class MyLogger:
             display_title += " " * space_length
         return display_title
 
+    def start_buffer(self):
+        self._local.buffer = []
+
+    def end_buffer(self):
+        buffer = getattr(self._local, "buffer", None)
+        self._local.buffer = None
+        return buffer if buffer else []
+
+    def flush_buffer(self, buffer):
+        for level, msg, args, kwargs in buffer:
+            self._log(level, msg, args, **kwargs)
+
     def ghost(self, text):
+        if getattr(self._local, "buffer", None) is not None:
+            return
         if not self.ignore_ghost:
             try:
                 final_text = f"| {text}"
@@ -220,6 +235,8 @@ class MyLogger:
             self.spacing = len(text) + 2
 
     def exorcise(self):
+        if getattr(self._local, "buffer", None) is not None:
+            return
         if not self.ignore_ghost:
             print(self._space(" "), end="\r")
             self.spacing = 0
@@ -228,12 +245,17 @@ class MyLogger:
         if str(text) not in self.secrets:
             self.secrets.append(str(text))
 
-    def _log(self, level, msg, args, exc_info=None, extra=None, stack_info=False, stacklevel=1):
+    def _log(self, level, msg, args, exc_info=None, extra=None, stack_info=False, stacklevel=1, caller=None):
+        if getattr(self._local, "buffer", None) is not None:
+            if exc_info and not isinstance(exc_info, (BaseException, tuple)):
+                exc_info = sys.exc_info()
+            self._local.buffer.append((level, msg, args, {"exc_info": exc_info, "extra": extra, "caller": self.findCaller(stack_info, stacklevel)}))
+            return
         if self.spacing > 0:
             self.exorcise()
         if "\n" in msg:
             for i, line in enumerate(msg.split("\n")):
-                self._log(level, line, args, exc_info=exc_info, extra=extra, stack_info=stack_info, stacklevel=stacklevel)
+                self._log(level, line, args, exc_info=exc_info, extra=extra, stack_info=stack_info, stacklevel=stacklevel, caller=caller)
                 if i == 0:
                     for handler in self._logger.handlers:
                         if isinstance(handler, RotatingFileHandler):
@@ -250,9 +272,12 @@ class MyLogger:
             if "HTTPSConnectionPool" in msg:
                 msg = re.sub("HTTPSConnectionPool\\((.*?)\\)", "HTTPSConnectionPool(redacted)", msg)
             try:
-                if not _srcfile:
+                if caller:
+                    fn, lno, func, sinfo = caller
+                elif not _srcfile:
                     raise ValueError
-                fn, lno, func, sinfo = self.findCaller(stack_info, stacklevel)
+                else:
+                    fn, lno, func, sinfo = self.findCaller(stack_info, stacklevel)
             except ValueError:
                 fn, lno, func, sinfo = "(unknown file)", 0, "(unknown function)", None
             if exc_info:
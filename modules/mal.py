@@ -1,4 +1,5 @@
-import re, secrets, time, webbrowser
+import math, re, secrets, webbrowser
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from json import JSONDecodeError
 from modules import util
 from modules.util import Failed, TimeoutExpired, YAML
@@ -172,9 +173,7 @@ class MyAnimeList:
             raise Failed(f"MyAnimeList Error: Connection Failed")
 
     def _jiken_request(self, url, params=None):
-        data = self.config.get_json(f"{jiken_base_url}{url}", params=params)
-        time.sleep(2)
-        return data
+        return self.config.get_json(f"{jiken_base_url}{url}", params=params)
 
     def _parse_request(self, url):
         data = self._request(url)
@@ -210,31 +209,30 @@ class MyAnimeList:
             if total_items < limit or limit <= 0:
                 limit = total_items
         per_page = len(data["data"])
+        if limit and per_page:
+            last_visible_page = min(last_visible_page, math.ceil(limit / per_page))
+
+        def get_page(page_num):
+            page_data = data
+            for _ in range(7):
+                if page_num > 1:
+                    page_data = self._jiken_request(endpoint, {**(params if params else {}), "page": page_num})
+                if "data" in page_data:
+                    return page_data["data"]
+            logger.debug(page_data)
+            raise Failed("MyAnimeList Error: Connection Failed")
+
+        pages = {1: get_page(1)}
+        with ThreadPoolExecutor(max_workers=self.config.general["max_workers"]) as executor:
+            futures = {executor.submit(get_page, i): i for i in range(2, last_visible_page + 1)}
+            for i, future in enumerate(as_completed(futures), 2):
+                logger.ghost(f"Parsing Page {i}/{last_visible_page}")
+                pages[futures[future]] = future.result()
         mal_ids = []
-        current_page = 1
-        chances = 0
-        while current_page <= last_visible_page:
-            if chances > 6:
-                logger.debug(data)
-                raise Failed("AniList Error: Connection Failed")
-            start_num = (current_page - 1) * per_page + 1
-            end_num = limit if limit and (current_page == last_visible_page or limit < start_num + per_page) else current_page * per_page
-            logger.ghost(f"Parsing Page {current_page}/{last_visible_page} {start_num}-{end_num}")
-            if current_page > 1:
-                if params is None:
-                    params = {}
-                params["page"] = current_page
-                data = self._jiken_request(endpoint, params)
-            if "data" in data:
-                chances = 0
-                mal_ids.extend(data["data"])
-                if limit and len(mal_ids) >= limit:
-                    return mal_ids[:limit]
-                current_page += 1
-            else:
-                chances += 1
+        for i in range(1, last_visible_page + 1):
+            mal_ids.extend(pages[i])
         logger.exorcise()
-        return mal_ids
+        return mal_ids[:limit] if limit else mal_ids
 
     def get_mal_ids(self, method, data):
         if method == "mal_id":
@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from json import JSONDecodeError
 from modules import util
@@ -66,6 +67,7 @@ class Mdblist:
         self.apikey = None
         self.expiration = 60
         self.limit = False
+        self._mdb = {}
 
     def add_key(self, apikey, expiration):
         self.apikey = apikey
@@ -81,7 +83,7 @@ class Mdblist:
     def has_key(self):
         return self.apikey is not None
 
-    def _request(self, imdb_id=None, tmdb_id=None, tvdb_id=None, is_movie=True, ignore_cache=False):
+    def _key(self, imdb_id=None, tmdb_id=None, tvdb_id=None, is_movie=True):
         params = {"apikey": self.apikey}
         if imdb_id:
             params["i"] = imdb_id
@@ -96,6 +98,14 @@ class Mdblist:
             key = f"{'tvm' if is_movie else 'tvs'}{tvdb_id}"
         else:
             raise Failed("MdbList Error: Either IMDb ID, TVDb ID, or TMDb ID and TMDb Type Required")
+        return key, params
+
+    def _request(self, imdb_id=None, tmdb_id=None, tvdb_id=None, is_movie=True, ignore_cache=False):
+        key, params = self._key(imdb_id=imdb_id, tmdb_id=tmdb_id, tvdb_id=tvdb_id, is_movie=is_movie)
+        if key in self._mdb and not ignore_cache:
+            if isinstance(self._mdb[key], Failed):
+                raise self._mdb[key]
+            return self._mdb[key]
         expired = None
         if self.config.Cache and not ignore_cache:
             mdb_dict, expired = self.config.Cache.query_mdb(key, self.expiration)
@@ -110,11 +120,15 @@ class Mdblist:
         if "response" in response and response["response"] is False:
             if response["error"] == "API Limit Reached!":
                 self.limit = True
+            elif not ignore_cache:
+                self._mdb[key] = Failed(f"MdbList Error: {response['error']}")
             raise Failed(f"MdbList Error: {response['error']}")
         else:
             mdb = MDbObj(response)
             if self.config.Cache and not ignore_cache:
                 self.config.Cache.update_mdb(expired, key, mdb, self.expiration)
+            if not ignore_cache:
+                self._mdb[key] = mdb
             return mdb
 
     def get_imdb(self, imdb_id):
@@ -126,6 +140,41 @@ class Mdblist:
     def get_movie(self, tmdb_id):
         return self._request(tmdb_id=tmdb_id, is_movie=True)
 
+    def prefetch(self, id_sets, is_show=False):
+        lookups = []
+        for tmdb_id, tvdb_id, imdb_id in id_sets:
+            lookup = []
+            if is_show and tvdb_id:
+                lookup.append({"tvdb_id": tvdb_id, "is_movie": False})
+            if tmdb_id:
+                lookup.append({"tmdb_id": tmdb_id, "is_movie": True})
+            if imdb_id:
+                lookup.append({"imdb_id": imdb_id})
+            if lookup:
+                lookups.append(lookup)
+        keys = {self._key(**kwargs)[0] for lookup in lookups for kwargs in lookup}
+        cache_data = self.config.Cache.query_mdbs([k for k in keys if k not in self._mdb], self.expiration) if self.config.Cache else {}
+        for key, (mdb_dict, expired) in cache_data.items():
+            if expired is False:
+                self._mdb[key] = MDbObj(mdb_dict)
+        missing = [lookup for lookup in lookups if self._key(**lookup[0])[0] not in self._mdb]
+        logger.debug(f"MdbList Prefetch: {len(lookups) - len(missing)} Cached, {len(missing)} to Fetch")
+
+        def get_mdb(lookup):
+            for kwargs in lookup:
+                if self.limit is not False:
+                    return
+                try:
+                    return self._request(**kwargs)
+                except Failed as e:
+                    logger.trace(e)
+
+        with ThreadPoolExecutor(max_workers=self.config.general["max_workers"]) as executor:
+            for future in as_completed([executor.submit(get_mdb, lookup) for lookup in missing]):
+                future.result()
+        if self.limit is not False:
+            logger.warning("MdbList Prefetch stopped: Daily MdbList Limit Reached")
+
     def validate_mdblist_lists(self, error_type, mdb_lists):
         valid_lists = []
         for mdb_dict in util.get_list(mdb_lists, split=False):
@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from modules import util
 from modules.util import Failed
@@ -47,10 +48,15 @@ class OMDb:
         self.apikey = params["apikey"]
         self.expiration = params["expiration"]
         self.limit = False
+        self._omdb = {}
         logger.secret(self.apikey)
         self.get_omdb("tt0080684", ignore_cache=True)
 
     def get_omdb(self, imdb_id, ignore_cache=False):
+        if imdb_id in self._omdb and not ignore_cache:
+            if isinstance(self._omdb[imdb_id], Failed):
+                raise self._omdb[imdb_id]
+            return self._omdb[imdb_id]
         expired = None
         if self.config.Cache and not ignore_cache:
             omdb_dict, expired = self.config.Cache.query_omdb(imdb_id, self.expiration)
@@ -59,12 +65,45 @@ class OMDb:
         logger.trace(f"IMDb ID: {imdb_id}")
         response = self.config.get(base_url, params={"i": imdb_id, "apikey": self.apikey})
         if response.status_code < 400:
-            omdb = OMDbObj(imdb_id, response.json())
+            try:
+                omdb = OMDbObj(imdb_id, response.json())
+            except Failed as e:
+                if not ignore_cache:
+                    self._omdb[imdb_id] = e
+                raise
             if self.config.Cache and not ignore_cache:
                 self.config.Cache.update_omdb(expired, omdb, self.expiration)
+            if not ignore_cache:
+                self._omdb[imdb_id] = omdb
             return omdb
         else:
             error = response.json()['Error']
             if error == "Request limit reached!":
                 self.limit = True
             raise Failed(f"OMDb Error: {error}")
+
+    def prefetch(self, imdb_ids):
+        imdb_ids = [i for i in set(imdb_ids) if i not in self._omdb]
+        if not imdb_ids:
+            return
+        cache_data = self.config.Cache.query_omdbs(imdb_ids, self.expiration) if self.config.Cache else {}
+        missing = []
+        for imdb_id in imdb_ids:
+            if imdb_id in cache_data and cache_data[imdb_id][1] is False:
+                self._omdb[imdb_id] = OMDbObj(imdb_id, cache_data[imdb_id][0])
+            else:
+                missing.append(imdb_id)
+        logger.debug(f"OMDb Prefetch: {len(imdb_ids) - len(missing)} Cached, {len(missing)} to Fetch")
+
+        def get_omdb(imdb_id):
+            if self.limit is False:
+                try:
+                    self.get_omdb(imdb_id)
+                except Failed as e:
+                    logger.debug(e)
+
+        with ThreadPoolExecutor(max_workers=self.config.general["max_workers"]) as executor:
+            for future in as_completed([executor.submit(get_omdb, i) for i in missing]):
+                future.result()
+        if self.limit is not False:
+            logger.warning("OMDb Prefetch stopped: Daily OMDb Limit Reached")
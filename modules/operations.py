@@ -1,4 +1,5 @@
 import os, re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from modules import plex, util
 from modules.util import Failed, YAML
@@ -46,6 +47,7 @@ class Operations:
         logger.debug(f"Genre Mapper: {self.library.genre_mapper}")
         logger.debug(f"Content Rating Mapper: {self.library.content_rating_mapper}")
         logger.debug(f"Metadata Backup: {self.library.metadata_backup}")
+        logger.debug(f"Operations Dry Run: {self.library.operations_dry_run}")
         logger.debug(f"Item Operation: {self.library.items_library_operation}")
         logger.debug("")
 
@@ -68,63 +70,42 @@ class Operations:
 
         if self.library.items_library_operation:
             items = self.library.get_all()
+            all_items = items
             radarr_adds = []
             sonarr_adds = []
             trakt_ratings = self.config.Trakt.user_ratings(self.library.is_movie) if any([o == "trakt_user" for o in self.library.meta_operations]) else []
 
             reverse_anidb = {}
-            if self.library.mass_genre_update == "anidb":
+            if any([o == "anidb" for o in self.library.meta_operations]):
                 for k, v in self.library.anidb_map.items():
                     reverse_anidb[v] = k
+                self.config.Convert.load_anime_ids()
+                self.config.AniDB.prefetch(self.library.anidb_map.keys())
+
+            item_ids = {}
+            prefetch_tmdb = any([o == "tmdb" for o in self.library.meta_operations])
+            prefetch_tvdb = any([o == "tvdb" for o in self.library.meta_operations])
+            prefetch_omdb = any([o == "omdb" for o in self.library.meta_operations]) and self.config.OMDb.limit is False
+            prefetch_mdb = any([o and o.startswith("mdb") for o in self.library.meta_operations]) and self.config.Mdblist.limit is False
+            if prefetch_tmdb or prefetch_tvdb or prefetch_omdb or prefetch_mdb:
+                for item in items:
+                    item_ids[item.ratingKey] = self.library.get_ids(item)
+                if prefetch_tmdb:
+                    self.config.TMDb.prefetch([self.config.TMDb.get_tmdb_id(t, tv, i, is_movie=self.library.is_movie) for t, tv, i in item_ids.values()], self.library.is_movie)
+                if prefetch_tvdb:
+                    self.config.TVDb.prefetch([tvdb_id for _, tvdb_id, _ in item_ids.values() if tvdb_id], is_movie=self.library.is_movie)
+                if prefetch_omdb:
+                    self.config.OMDb.prefetch([imdb_id for _, _, imdb_id in item_ids.values() if imdb_id])
+                if prefetch_mdb:
+                    self.config.Mdblist.prefetch(item_ids.values(), is_show=self.library.is_show)
 
             if self.library.assets_for_all and not self.library.asset_directory:
                 logger.error("Asset Error: No Asset Directory for Assets For All")
 
-            for i, item in enumerate(items, 1):
-                try:
-                    item = self.library.reload(item)
-                except Failed as e:
-                    logger.error(e)
-                    continue
-                logger.info("")
-                logger.info(f"Processing: {i}/{len(items)} {item.title}")
-                current_labels = [la.tag for la in self.library.item_labels(item)] if self.library.assets_for_all or self.library.mass_imdb_parental_labels else []
-
-                if self.library.assets_for_all and self.library.asset_directory:
-                    self.library.find_and_upload_assets(item, current_labels)
-
-                tmdb_id, tvdb_id, imdb_id = self.library.get_ids(item)
-
-                item.batchEdits()
-                batch_display = ""
-
-                if self.library.remove_title_parentheses:
-                    if not any([f.name == "title" and f.locked for f in item.fields]) and item.title.endswith(")"):
-                        new_title = re.sub(" \\(\\w+\\)$", "", item.title)
-                        item.editTitle(new_title)
-                        batch_display += f"\n{item.title[:25]:<25} | Title | {new_title}"
-
-                if self.library.mass_imdb_parental_labels:
-                    try:
-                        parental_guide = self.config.IMDb.parental_guide(imdb_id)
-                        parental_labels = [f"{k.capitalize()}:{v}" for k, v in parental_guide.items() if self.library.mass_imdb_parental_labels == "with_none" or v != "None"]
-                        add_labels = [la for la in parental_labels if la not in current_labels]
-                        remove_labels = [la for la in current_labels if la in util.parental_labels and la not in parental_labels]
-                        if add_labels or remove_labels:
-                            batch_display += f"\n{self.library.edit_tags('label', item, add_tags=add_labels, remove_tags=remove_labels, do_print=False)}"
-                    except Failed:
-                        pass
-                if item.locations:
-                    path = os.path.dirname(str(item.locations[0])) if self.library.is_movie else str(item.locations[0])
-                    if self.library.Radarr and self.library.radarr_add_all_existing and tmdb_id:
-                        path = path.replace(self.library.Radarr.plex_path, self.library.Radarr.radarr_path)
-                        path = path[:-1] if path.endswith(('/', '\\')) else path
-                        radarr_adds.append((tmdb_id, path))
-                    if self.library.Sonarr and self.library.sonarr_add_all_existing and tvdb_id:
-                        path = path.replace(self.library.Sonarr.plex_path, self.library.Sonarr.sonarr_path)
-                        path = path[:-1] if path.endswith(("/", "\\")) else path
-                        sonarr_adds.append((tvdb_id, path))
+            def get_item_ids(item):
+                return item_ids[item.ratingKey] if item.ratingKey in item_ids else self.library.get_ids(item)
 
+            def get_targets(item, tmdb_id, tvdb_id, imdb_id):
                 tmdb_item = None
                 if any([o == "tmdb" for o in self.library.meta_operations]):
                     tmdb_item = self.config.TMDb.get_item(item, tmdb_id, tvdb_id, imdb_id, is_movie=self.library.is_movie)
@@ -242,85 +223,213 @@ class Operations:
                         raise Failed
                     return found_rating
 
-                if self.library.mass_genre_update or self.library.genre_mapper:
+                targets = {}
+                if self.library.mass_genre_update:
+                    new_genres = None
+                    if tmdb_item and self.library.mass_genre_update == "tmdb":
+                        new_genres = tmdb_item.genres
+                    elif imdb_id and self.library.mass_genre_update == "imdb" and imdb_id in self.config.IMDb.genres:
+                        new_genres = self.config.IMDb.genres[imdb_id]
+                    elif omdb_item and self.library.mass_genre_update == "omdb":
+                        new_genres = omdb_item.genres
+                    elif tvdb_item and self.library.mass_genre_update == "tvdb":
+                        new_genres = tvdb_item.genres
+                    elif anidb_item and self.library.mass_genre_update == "anidb":
+                        new_genres = anidb_item.tags
+                    if new_genres is not None:
+                        targets["genre"] = new_genres
+                        if not new_genres:
+                            logger.info(f"No Genres Found")
+
+                for field, attribute, display in rating_fields:
+                    if getattr(self.library, attribute):
+                        try:
+                            targets[field] = get_rating(getattr(self.library, attribute))
+                        except Failed:
+                            logger.info(f"No {display} Found")
+
+                if self.library.mass_content_rating_update:
+                    if omdb_item and self.library.mass_content_rating_update == "omdb":
+                        targets["contentRating"] = omdb_item.content_rating
+                    elif mdb_item and self.library.mass_content_rating_update == "mdb":
+                        targets["contentRating"] = mdb_item.content_rating if mdb_item.content_rating else None
+                    elif mdb_item and self.library.mass_content_rating_update == "mdb_commonsense":
+                        targets["contentRating"] = mdb_item.commonsense if mdb_item.commonsense else None
+
+                if self.library.mass_originally_available_update:
+                    new_date = False
+                    if omdb_item and self.library.mass_originally_available_update == "omdb":
+                        new_date = omdb_item.released
+                    elif mdb_item and self.library.mass_originally_available_update == "mdb":
+                        new_date = mdb_item.released
+                    elif tvdb_item and self.library.mass_originally_available_update == "tvdb":
+                        new_date = tvdb_item.release_date
+                    elif tmdb_item and self.library.mass_originally_available_update == "tmdb":
+                        new_date = tmdb_item.release_date if self.library.is_movie else tmdb_item.first_air_date
+                    elif anidb_item and self.library.mass_originally_available_update == "anidb":
+                        new_date = anidb_item.released
+                    if new_date:
+                        targets["originallyAvailableAt"] = new_date
+                    elif new_date is not False:
+                        logger.info(f"No Originally Available Date Found")
+
+                return targets
+
+            def get_content_rating(item, targets):
+                if self.library.mass_content_rating_update and "contentRating" not in targets:
+                    raise Failed
+                new_rating = targets["contentRating"] if "contentRating" in targets else None
+                if self.library.content_rating_mapper:
+                    if new_rating is None:
+                        new_rating = item.contentRating
+                    if new_rating in self.library.content_rating_mapper:
+                        new_rating = self.library.content_rating_mapper[new_rating]
+                return new_rating
+
+            def get_genres(item, targets):
+                new_genres = targets["genre"] if "genre" in targets else []
+                if self.library.genre_mapper:
+                    if not new_genres:
+                        new_genres = [g.tag for g in item.genres]
+                    mapped_genres = []
+                    for genre in new_genres:
+                        if genre in self.library.genre_mapper:
+                            if self.library.genre_mapper[genre]:
+                                mapped_genres.append(self.library.genre_mapper[genre])
+                        else:
+                            mapped_genres.append(genre)
+                    new_genres = mapped_genres
+                return new_genres
+
+            planned_targets = {}
+
+            def plan_item(item):
+                logger.start_buffer()
+                changes = []
+                try:
+                    targets = get_targets(item, *get_item_ids(item))
+                    planned_targets[item.ratingKey] = targets
+                    if self.library.remove_title_parentheses and item.title.endswith(")"):
+                        changes.append("Title")
+                    if "genre" in targets or (self.library.genre_mapper and not self.library.mass_genre_update):
+                        if set(get_genres(item, targets)) != set([g.tag for g in item.genres]):
+                            changes.append("Genres")
+                    for field, _, display in rating_fields:
+                        if field in targets and str(getattr(item, field)) != str(targets[field]):
+                            changes.append(display)
+                    if self.library.mass_content_rating_update or self.library.content_rating_mapper:
+                        try:
+                            new_rating = get_content_rating(item, targets)
+                            if new_rating and str(item.contentRating) != str(new_rating):
+                                changes.append("Content Rating")
+                        except Failed:
+                            pass
+                    if "originallyAvailableAt" in targets and str(item.originallyAvailableAt) != str(targets["originallyAvailableAt"]):
+                        changes.append("Originally Available Date")
+                except Failed as e:
+                    logger.error(e)
+                    changes.append("Unknown")
+                except Exception as ex:
+                    changes = ex
+                return changes, logger.end_buffer()
+
+            rating_fields = [
+                ("audienceRating", "mass_audience_rating_update", "Audience Rating"),
+                ("rating", "mass_critic_rating_update", "Critic Rating"),
+                ("userRating", "mass_user_rating_update", "User Rating")
+            ]
+            episode_ops = [self.library.mass_episode_audience_rating_update, self.library.mass_episode_critic_rating_update, self.library.mass_episode_user_rating_update]
+            always_reload = (self.library.assets_for_all and self.library.asset_directory) or self.library.mass_imdb_parental_labels \
+                            or (self.library.Radarr and self.library.radarr_add_all_existing) or (self.library.Sonarr and self.library.sonarr_add_all_existing)
+
+            if self.library.operations_dry_run or not always_reload:
+                logger.info("")
+                logger.separator(f"Planning {len(items)} Items", space=False, border=False)
+                plan = {}
+                changes = []
+                with ThreadPoolExecutor(max_workers=self.config.general["max_workers"]) as executor:
+                    for item_changes, buffer in executor.map(plan_item, items):
+                        logger.flush_buffer(buffer)
+                        if isinstance(item_changes, Exception):
+                            raise item_changes
+                        changes.append(item_changes)
+                for item_changes in changes:
+                    for change in item_changes:
+                        plan[change] = plan[change] + 1 if change in plan else 1
+                planned_items = [item for item, item_changes in zip(items, changes) if item_changes]
+                logger.info("")
+                for change, count in plan.items():
+                    logger.info(f"{change}: {count} Item{'s' if count > 1 else ''}")
+                logger.info(f"{len(planned_items)} of {len(items)} Items Need Updates")
+                if always_reload:
+                    logger.info("All Items are Processed for Assets, Parental Labels, or Radarr/Sonarr Adds")
+                if self.library.operations_dry_run:
+                    items = []
+                elif not always_reload:
+                    items = planned_items
+
+            def process_item(i, item):
+                try:
+                    item = self.library.reload(item)
+                except Failed as e:
+                    logger.error(e)
+                    return None
+                logger.info("")
+                logger.info(f"Processing: {i}/{len(items)} {item.title}")
+                current_labels = [la.tag for la in self.library.item_labels(item)] if self.library.assets_for_all or self.library.mass_imdb_parental_labels else []
+
+                if self.library.assets_for_all and self.library.asset_directory:
+                    with self.library.write_semaphore:
+                        self.library.find_and_upload_assets(item, current_labels)
+
+                tmdb_id, tvdb_id, imdb_id = get_item_ids(item)
+
+                item.batchEdits()
+                batch_display = ""
+
+                if self.library.remove_title_parentheses:
+                    if not any([f.name == "title" and f.locked for f in item.fields]) and item.title.endswith(")"):
+                        new_title = re.sub(" \\(\\w+\\)$", "", item.title)
+                        item.editTitle(new_title)
+                        batch_display += f"\n{item.title[:25]:<25} | Title | {new_title}"
+
+                if self.library.mass_imdb_parental_labels:
                     try:
-                        new_genres = []
-                        if self.library.mass_genre_update:
-                            if tmdb_item and self.library.mass_genre_update == "tmdb":
-                                new_genres = tmdb_item.genres
-                            elif imdb_id and self.library.mass_genre_update == "imdb" and imdb_id in self.config.IMDb.genres:
-                                new_genres = self.config.IMDb.genres[imdb_id]
-                            elif omdb_item and self.library.mass_genre_update == "omdb":
-                                new_genres = omdb_item.genres
-                            elif tvdb_item and self.library.mass_genre_update == "tvdb":
-                                new_genres = tvdb_item.genres
-                            elif anidb_item and self.library.mass_genre_update == "anidb":
-                                new_genres = anidb_item.tags
-                            else:
-                                raise Failed
-                            if not new_genres:
-                                logger.info(f"No Genres Found")
-                        if self.library.genre_mapper:
-                            if not new_genres:
-                                new_genres = [g.tag for g in item.genres]
-                            mapped_genres = []
-                            for genre in new_genres:
-                                if genre in self.library.genre_mapper:
-                                    if self.library.genre_mapper[genre]:
-                                        mapped_genres.append(self.library.genre_mapper[genre])
-                                else:
-                                    mapped_genres.append(genre)
-                            new_genres = mapped_genres
-                        temp_display = self.library.edit_tags('genre', item, sync_tags=new_genres, do_print=False)
-                        if temp_display:
-                            batch_display += f"\n{temp_display}"
+                        parental_guide = self.config.IMDb.parental_guide(imdb_id)
+                        parental_labels = [f"{k.capitalize()}:{v}" for k, v in parental_guide.items() if self.library.mass_imdb_parental_labels == "with_none" or v != "None"]
+                        add_labels = [la for la in parental_labels if la not in current_labels]
+                        remove_labels = [la for la in current_labels if la in util.parental_labels and la not in parental_labels]
+                        if add_labels or remove_labels:
+                            batch_display += f"\n{self.library.edit_tags('label', item, add_tags=add_labels, remove_tags=remove_labels, do_print=False)}"
                     except Failed:
                         pass
+                if item.locations:
+                    path = os.path.dirname(str(item.locations[0])) if self.library.is_movie else str(item.locations[0])
+                    if self.library.Radarr and self.library.radarr_add_all_existing and tmdb_id:
+                        path = path.replace(self.library.Radarr.plex_path, self.library.Radarr.radarr_path)
+                        path = path[:-1] if path.endswith(('/', '\\')) else path
+                        radarr_adds.append((tmdb_id, path))
+                    if self.library.Sonarr and self.library.sonarr_add_all_existing and tvdb_id:
+                        path = path.replace(self.library.Sonarr.plex_path, self.library.Sonarr.sonarr_path)
+                        path = path[:-1] if path.endswith(("/", "\\")) else path
+                        sonarr_adds.append((tvdb_id, path))
 
-                if self.library.mass_audience_rating_update:
-                    try:
-                        new_rating = get_rating(self.library.mass_audience_rating_update)
-                        if str(item.audienceRating) != str(new_rating):
-                            item.editField("audienceRating", new_rating)
-                            batch_display += f"\nAudience Rating | {new_rating}"
-                    except Failed:
-                        logger.info(f"No Audience Rating Found")
+                targets = planned_targets[item.ratingKey] if item.ratingKey in planned_targets else get_targets(item, tmdb_id, tvdb_id, imdb_id)
 
-                if self.library.mass_critic_rating_update:
-                    try:
-                        new_rating = get_rating(self.library.mass_critic_rating_update)
-                        if str(item.rating) != str(new_rating):
-                            item.editField("rating", new_rating)
-                            batch_display += f"\nCritic Rating | {new_rating}"
-                    except Failed:
-                        logger.info(f"No Critic Rating Found")
+                if "genre" in targets or (self.library.genre_mapper and not self.library.mass_genre_update):
+                    new_genres = get_genres(item, targets)
+                    temp_display = self.library.edit_tags('genre', item, sync_tags=new_genres, do_print=False)
+                    if temp_display:
+                        batch_display += f"\n{temp_display}"
 
-                if self.library.mass_user_rating_update:
-                    try:
-                        new_rating = get_rating(self.library.mass_user_rating_update)
-                        if str(item.userRating) != str(new_rating):
-                            item.editField("userRating", new_rating)
-                            batch_display += f"\nUser Rating | {new_rating}"
-                    except Failed:
-                        logger.info(f"No User Rating Found")
+                for field, _, display in rating_fields:
+                    if field in targets and str(getattr(item, field)) != str(targets[field]):
+                        item.editField(field, targets[field])
+                        batch_display += f"\n{display} | {targets[field]}"
 
                 if self.library.mass_content_rating_update or self.library.content_rating_mapper:
                     try:
-                        new_rating = None
-                        if self.library.mass_content_rating_update:
-                            if omdb_item and self.library.mass_content_rating_update == "omdb":
-                                new_rating = omdb_item.content_rating
-                            elif mdb_item and self.library.mass_content_rating_update == "mdb":
-                                new_rating = mdb_item.content_rating if mdb_item.content_rating else None
-                            elif mdb_item and self.library.mass_content_rating_update == "mdb_commonsense":
-                                new_rating = mdb_item.commonsense if mdb_item.commonsense else None
-                            else:
-                                raise Failed
-                        if self.library.content_rating_mapper:
-                            if new_rating is None:
-                                new_rating = item.contentRating
-                            if new_rating in self.library.content_rating_mapper:
-                                new_rating = self.library.content_rating_mapper[new_rating]
+                        new_rating = get_content_rating(item, targets)
                         if not new_rating:
                             logger.info(f"No Content Rating Found")
                         elif str(item.contentRating) != str(new_rating):
@@ -328,100 +437,127 @@ class Operations:
                             batch_display += f"\nContent Rating | {new_rating}"
                     except Failed:
                         pass
-                if self.library.mass_originally_available_update:
-                    try:
-                        if omdb_item and self.library.mass_originally_available_update == "omdb":
-                            new_date = omdb_item.released
-                        elif mdb_item and self.library.mass_originally_available_update == "mdb":
-                            new_date = mdb_item.released
-                        elif tvdb_item and self.library.mass_originally_available_update == "tvdb":
-                            new_date = tvdb_item.release_date
-                        elif tmdb_item and self.library.mass_originally_available_update == "tmdb":
-                            new_date = tmdb_item.release_date if self.library.is_movie else tmdb_item.first_air_date
-                        elif anidb_item and self.library.mass_originally_available_update == "anidb":
-                            new_date = anidb_item.released
-                        else:
-                            raise Failed
-                        if not new_date:
-                            logger.info(f"No Originally Available Date Found")
-                        elif str(item.originallyAvailableAt) != str(new_date):
-                            item.editOriginallyAvailable(new_date)
-                            batch_display += f"\nOriginally Available Date | {new_date.strftime('%Y-%m-%d')}"
-                    except Failed:
-                        pass
-
-                item.saveEdits()
-                if len(batch_display) > 0:
+                if "originallyAvailableAt" in targets and str(item.originallyAvailableAt) != str(targets["originallyAvailableAt"]):
+                    new_date = targets["originallyAvailableAt"]
+                    item.editOriginallyAvailable(new_date)
+                    batch_display += f"\nOriginally Available Date | {new_date.strftime('%Y-%m-%d')}"
+
+                with self.library.write_semaphore:
+                    item.saveEdits()
+                edited = len(batch_display) > 0
+                if edited:
                     logger.info(f"Batch Edits{batch_display}")
+                return edited
 
-                episode_ops = [self.library.mass_episode_audience_rating_update, self.library.mass_episode_critic_rating_update, self.library.mass_episode_user_rating_update]
-
-                if any([x is not None for x in episode_ops]):
+            def run_item(i, item):
+                logger.start_buffer()
+                try:
+                    result = process_item(i, item)
+                except Exception as ex:
+                    result = ex
+                return result, logger.end_buffer()
 
-                    if any([x == "imdb" for x in episode_ops]) and not imdb_id:
-                        logger.info(f"No IMDb ID for Guid: {item.guid}")
+            num_edited = 0
+            num_failed = 0
+            with ThreadPoolExecutor(max_workers=self.config.general["max_workers"]) as executor:
+                futures = [executor.submit(run_item, i, item) for i, item in enumerate(items, 1)]
+                for future in futures:
+                    result, buffer = future.result()
+                    logger.flush_buffer(buffer)
+                    if isinstance(result, Exception):
+                        for f in futures:
+                            f.cancel()
+                        raise result
+                    elif result is None:
+                        num_failed += 1
+                    elif result:
+                        num_edited += 1
+            logger.info("")
+            logger.info(f"{len(items)} Items Processed; {num_edited} Edited; {num_failed} Failed to Load")
 
-                    for ep in item.episodes():
-                        ep.batchEdits()
-                        batch_display = ""
-                        item_title = self.library.get_item_sort_title(ep, atr="title")
-                        logger.info("")
-                        logger.info(f"Processing {item_title}")
-                        def get_episode_rating(attribute):
+            if any([x is not None for x in episode_ops]):
+                logger.info("")
+                episode_fields = [
+                    ("audienceRating", self.library.mass_episode_audience_rating_update, "Audience Rating"),
+                    ("rating", self.library.mass_episode_critic_rating_update, "Critic Rating"),
+                    ("userRating", self.library.mass_episode_user_rating_update, "User Rating")
+                ]
+                shows = {item.ratingKey: item for item in all_items}
+                show_episodes = {}
+                for ep in self.library.get_all(builder_level="episode"):
+                    if ep.grandparentRatingKey in shows:
+                        if ep.grandparentRatingKey not in show_episodes:
+                            show_episodes[ep.grandparentRatingKey] = []
+                        show_episodes[ep.grandparentRatingKey].append(ep)
+
+                def get_episode_edits(show, episodes):
+                    logger.start_buffer()
+                    edits = []
+                    try:
+                        tmdb_id, tvdb_id, imdb_id = get_item_ids(show)
+                        tmdb_item = None
+                        if any([x == "tmdb" for x in episode_ops]):
+                            tmdb_item = self.config.TMDb.get_item(show, tmdb_id, tvdb_id, imdb_id, is_movie=False)
+                        if any([x == "imdb" for x in episode_ops]) and not imdb_id:
+                            logger.info(f"No IMDb ID for Guid: {show.guid}")
+
+                        def get_episode_rating(attribute, ep):
                             if tmdb_item and attribute == "tmdb":
                                 try:
-                                    return self.config.TMDb.get_episode(tmdb_item.tmdb_id, ep.seasonNumber, ep.episodeNumber).vote_average
-                                except Failed as er:
+                                    episode_ratings = self.config.TMDb.get_episode_ratings(tmdb_item.tmdb_id, ep.seasonNumber)
+                                    return episode_ratings[ep.episodeNumber] if episode_ratings and ep.episodeNumber in episode_ratings else None
+                                except (Failed, TypeError, ValueError) as er:
                                     logger.error(er)
                             elif imdb_id and attribute == "imdb":
                                 return self.config.IMDb.get_episode_rating(imdb_id, ep.seasonNumber, ep.episodeNumber)
-                            else:
-                                raise Failed
-
-                        if self.library.mass_episode_audience_rating_update:
-                            try:
-                                new_rating = get_episode_rating(self.library.mass_episode_audience_rating_update)
-                                if not new_rating:
-                                    logger.info(f"No Audience Rating Found")
-                                elif str(ep.audienceRating) != str(new_rating):
-                                    ep.editField("audienceRating", new_rating)
-                                    batch_display += f"\nAudience Rating | {new_rating}"
-                            except Failed:
-                                pass
-
-                        if self.library.mass_episode_critic_rating_update:
-                            try:
-                                new_rating = get_episode_rating(self.library.mass_episode_critic_rating_update)
-                                if not new_rating:
-                                    logger.info(f"No Critic Rating Found")
-                                elif str(ep.rating) != str(new_rating):
-                                    ep.editField("rating", new_rating)
-                                    batch_display += f"\nCritic Rating | {new_rating}"
-                            except Failed:
-                                pass
-
-                        if self.library.mass_episode_user_rating_update:
-                            try:
-                                new_rating = get_episode_rating(self.library.mass_episode_user_rating_update)
-                                if not new_rating:
-                                    logger.info(f"No User Rating Found")
-                                elif str(ep.userRating) != str(new_rating):
-                                    ep.editField("userRating", new_rating)
-                                    batch_display += f"\nUser Rating | {new_rating}"
-                            except Failed:
-                                pass
 
+                        for ep in episodes:
+                            ep_edits = {}
+                            for field, attribute, _ in episode_fields:
+                                if attribute:
+                                    new_rating = get_episode_rating(attribute, ep)
+                                    if new_rating and str(getattr(ep, field)) != str(new_rating):
+                                        ep_edits[field] = new_rating
+                            if ep_edits:
+                                edits.append((ep, ep_edits))
+                    except Exception as ex:
+                        return ex, logger.end_buffer()
+                    return edits, logger.end_buffer()
+
+                def save_episode(ep, ep_edits):
+                    ep.batchEdits()
+                    for field, new_rating in ep_edits.items():
+                        ep.editField(field, new_rating)
+                    with self.library.write_semaphore:
                         ep.saveEdits()
-                        if len(batch_display) > 0:
-                            logger.info(f"Batch Edits:{batch_display}")
 
-            if self.library.Radarr and self.library.radarr_add_all_existing:
+                num_episodes = sum([len(e) for e in show_episodes.values()])
+                episode_edits = []
+                with ThreadPoolExecutor(max_workers=self.config.general["max_workers"]) as executor:
+                    futures = [executor.submit(get_episode_edits, shows[k], e) for k, e in show_episodes.items()]
+                    for future in futures:
+                        result, buffer = future.result()
+                        logger.flush_buffer(buffer)
+                        if isinstance(result, Exception):
+                            for f in futures:
+                                f.cancel()
+                            raise result
+                        for ep, ep_edits in result:
+                            logger.info(f"{self.library.get_item_sort_title(ep, atr='title')} | {' | '.join([f'{d} | {ep_edits[f]}' for f, _, d in episode_fields if f in ep_edits])}")
+                        episode_edits.extend(result)
+                    if not self.library.operations_dry_run:
+                        for future in as_completed([executor.submit(save_episode, ep, ep_edits) for ep, ep_edits in episode_edits]):
+                            future.result()
+                logger.info("")
+                logger.info(f"{num_episodes} Episodes Processed; {len(episode_edits)} {'Need Updates' if self.library.operations_dry_run else 'Edited'}")
+
+            if self.library.Radarr and self.library.radarr_add_all_existing and not self.library.operations_dry_run:
                 try:
                     self.library.Radarr.add_tmdb(radarr_adds)
                 except Failed as e:
                     logger.error(e)
 
-            if self.library.Sonarr and self.library.sonarr_add_all_existing:
+            if self.library.Sonarr and self.library.sonarr_add_all_existing and not self.library.operations_dry_run:
                 try:
                     self.library.Sonarr.add_tvdb(sonarr_adds)
                 except Failed as e:
@@ -119,6 +119,10 @@ modifier_translation = {
     "": "", ".not": "!", ".is": "%3D", ".isnot": "!%3D", ".gt": "%3E%3E", ".gte": "%3E", ".lt": "%3C%3C", ".lte": "%3C",
     ".before": "%3C%3C", ".after": "%3E%3E", ".begins": "%3C", ".ends": "%3E", ".regex": "", ".rated": ""
 }
+listing_filters = [
+    "title", "summary", "studio", "record_label", "added", "release", "last_played", "history",
+    "user_rating", "critic_rating", "audience_rating", "plays", "duration", "year", "content_rating"
+]
 attribute_translation = {
     "aspect": "aspectRatio",
     "channels": "audioChannels",
@@ -427,6 +431,7 @@ class Plex(Library):
         logger.secret(self.url)
         logger.secret(self.token)
         try:
+            self.config.session.add_retried_host(self.url)
             self.PlexServer = PlexServer(baseurl=self.url, token=self.token, session=self.config.session, timeout=self.timeout)
             plexapi.server.TIMEOUT = self.timeout
             os.environ["PLEXAPI_PLEXAPI_TIMEOUT"] = str(self.timeout)
@@ -518,6 +523,19 @@ class Plex(Library):
             self._all_items = results
         return results
 
+    def get_updated_items(self, updated_since):
+        logger.info(f"Loading {self.type}s Updated Since {updated_since.strftime('%Y-%m-%d %H:%M:%S')} from Library: {self.name}")
+        return self.search(**{"updatedAt>>": updated_since})
+
+    @retry(stop_max_attempt_number=6, wait_fixed=10000, retry_on_exception=util.retry_if_not_plex)
+    def item_count(self):
+        return self.Plex.totalViewSize(includeCollections=False)
+
+    @retry(stop_max_attempt_number=6, wait_fixed=10000, retry_on_exception=util.retry_if_not_plex)
+    def get_rating_key_set(self):
+        _, type_key, _ = sort_types[self.Plex.TYPE]
+        return set([int(e.attrib["ratingKey"]) for e in self._query(f"/library/sections/{self.Plex.key}/all?type={type_key}") if "ratingKey" in e.attrib])
+
     def upload_theme(self, collection, url=None, filepath=None):
         key = f"/library/metadata/{collection.ratingKey}/themes"
         if url:
@@ -1327,15 +1345,46 @@ class Plex(Library):
             logger.warning(f"Collection Warning: {text} attribute will run as {final}")
         return attribute, modifier, final
 
+    def compile_filters(self, filters_in):
+        return [self.compile_filter(filter_method, filter_data) for filter_method, filter_data in filters_in]
+
+    def compile_filter(self, filter_method, filter_data):
+        filter_attr, modifier, filter_final = self.split(filter_method)
+        filter_actual = attribute_translation[filter_attr] if filter_attr in attribute_translation else filter_attr
+        data_set = None
+        sub_filters = None
+        if modifier == ".regex" and isinstance(filter_data, list):
+            filter_data = [re.compile(d) for d in filter_data]
+        elif isinstance(filter_data, list):
+            data_set = frozenset(filter_data)
+        if filter_attr in ["seasons", "episodes", "albums", "tracks"]:
+            sub_filters = self.compile_sub_filters(filter_data)
+        reload = filter_attr not in listing_filters
+
+        def check(item, current_time):
+            return self.check_filter(item, filter_attr, modifier, filter_final, filter_data, current_time,
+                                     filter_actual=filter_actual, data_set=data_set, sub_filters=sub_filters, reload=reload)
+        return filter_final, check, reload
+
+    def compile_sub_filters(self, filter_data):
+        sub_filters = []
+        percentage = 60
+        for sub_atr, sub_data in filter_data.items():
+            if sub_atr == "percentage":
+                percentage = sub_data
+            else:
+                sub_filters.append(self.compile_filter(sub_atr, sub_data))
+        return sub_filters, percentage
+
     def check_filters(self, item, filters_in, current_time):
-        for filter_method, filter_data in filters_in:
-            filter_attr, modifier, filter_final = self.split(filter_method)
-            if self.check_filter(item, filter_attr, modifier, filter_final, filter_data, current_time) is False:
+        for _, check, _ in filters_in:
+            if check(item, current_time) is False:
                 return False
         return True
 
-    def check_filter(self, item, filter_attr, modifier, filter_final, filter_data, current_time):
-        filter_actual = attribute_translation[filter_attr] if filter_attr in attribute_translation else filter_attr
+    def check_filter(self, item, filter_attr, modifier, filter_final, filter_data, current_time, filter_actual=None, data_set=None, sub_filters=None, reload=True):
+        if filter_actual is None:
+            filter_actual = attribute_translation[filter_attr] if filter_attr in attribute_translation else filter_attr
         if isinstance(item, Movie):
             item_type = "movie"
         elif isinstance(item, Show):
@@ -1352,7 +1401,8 @@ class Plex(Library):
             item_type = "track"
         else:
             return True
-        item = self.reload(item)
+        if reload:
+            item = self.reload(item)
         if filter_attr not in builder.filters[item_type]:
             return True
         elif filter_attr in builder.date_filters:
@@ -1421,13 +1471,7 @@ class Plex(Library):
                 sub_items = item.tracks()
             else:
                 sub_items = item.episodes()
-            filters_in = []
-            percentage = 60
-            for sub_atr, sub_data in filter_data.items():
-                if sub_atr == "percentage":
-                    percentage = sub_data
-                else:
-                    filters_in.append((sub_atr, sub_data))
+            filters_in, percentage = sub_filters if sub_filters else self.compile_sub_filters(filter_data)
             failure_threshold = len(sub_items) * ((100 - percentage) / 100)
             failures = 0
             for sub_item in sub_items:
@@ -1488,11 +1532,12 @@ class Plex(Library):
                 has_match = False
                 for reg in filter_data:
                     for name in attrs:
-                        if re.compile(reg).search(name):
+                        if reg.search(name):
                             has_match = True
                 if has_match is False:
                     return False
-            elif (not list(set(filter_data) & set(attrs)) and modifier == "") \
-                    or (list(set(filter_data) & set(attrs)) and modifier == ".not"):
-                return False
+            else:
+                has_match = len((data_set if data_set is not None else set(filter_data)).intersection(attrs)) > 0
+                if (not has_match and modifier == "") or (has_match and modifier == ".not"):
+                    return False
         return True
@@ -1,11 +1,13 @@
+from concurrent.futures import ThreadPoolExecutor
 from modules import util
 from modules.util import Failed
 from arrapi import RadarrAPI
-from arrapi.exceptions import ArrException
+from arrapi.exceptions import ArrException, Invalid, NotFound
 
 logger = util.logger
 
 builders = ["radarr_all", "radarr_taglist"]
+invalid_lookup = "__invalid__"
 availability_translation = {"announced": "announced", "cinemas": "inCinemas", "released": "released", "db": "preDB"}
 apply_tags_translation = {"": "add", "sync": "replace", "remove": "remove"}
 availability_descriptions = {"announced": "For Announced", "cinemas": "For In Cinemas", "released": "For Released", "db": "For PreDB"}
@@ -36,6 +38,36 @@ class Radarr:
         self.search = params["search"]
         self.radarr_path = params["radarr_path"] if params["radarr_path"] and params["plex_path"] else ""
         self.plex_path = params["plex_path"] if params["radarr_path"] and params["plex_path"] else ""
+        self._movies = None
+        self._paths = {}
+        self._tags = {}
+
+    @property
+    def catalog(self):
+        if self._movies is None:
+            self._movies = {}
+            for movie in self.api.all_movies():
+                self._index(movie)
+        return self._movies
+
+    def _index(self, movie):
+        self._unindex(movie.tmdbId)
+        self._movies[movie.tmdbId] = movie
+        if movie.path:
+            self._paths[movie.path[:-1].lower() if movie.path.endswith(("/", "\\")) else movie.path.lower()] = movie.tmdbId
+        for tag in movie.tags:
+            if tag.id not in self._tags:
+                self._tags[tag.id] = set()
+            self._tags[tag.id].add(movie.tmdbId)
+
+    def _unindex(self, tmdb_id):
+        if tmdb_id in self._movies:
+            old = self._movies.pop(tmdb_id)
+            if old.path:
+                self._paths.pop(old.path[:-1].lower() if old.path.endswith(("/", "\\")) else old.path.lower(), None)
+            for tag in old.tags:
+                if tag.id in self._tags:
+                    self._tags[tag.id].discard(tmdb_id)
 
     def add_tmdb(self, tmdb_ids, **options):
         _ids = []
@@ -59,12 +91,8 @@ class Radarr:
         tags = options["tag"] if "tag" in options else self.tag
         search = options["search"] if "search" in options else self.search
 
-        arr_paths = {}
-        arr_ids = {}
-        for movie in self.api.all_movies():
-            if movie.path:
-                arr_paths[movie.path[:-1].lower() if movie.path.endswith(("/", "\\")) else movie.path.lower()] = movie.tmdbId
-            arr_ids[movie.tmdbId] = movie
+        arr_ids = self.catalog
+        arr_paths = self._paths
         logger.trace(arr_paths)
         logger.trace(arr_ids)
 
@@ -82,6 +110,8 @@ class Radarr:
             try:
                 _a, _e, _i = self.api.add_multiple_movies(movies, folder, quality_profile, monitor, search,
                                                           availability, tags, per_request=100)
+                for movie in _a:
+                    self._index(movie)
                 added.extend(_a)
                 exists.extend(_e)
                 invalid.extend(_i)
@@ -89,6 +119,7 @@ class Radarr:
                 logger.stacktrace()
                 raise Failed(f"Radarr Error: {e}")
 
+        lookups = []
         for i, item in enumerate(tmdb_ids, 1):
             path = item[1] if isinstance(item, tuple) else None
             tmdb_id = item[0] if isinstance(item, tuple) else item
@@ -98,29 +129,59 @@ class Radarr:
                 if _id:
                     skipped.append(item)
                     continue
+            if tmdb_id in arr_ids:
+                exists.append(arr_ids[tmdb_id])
+            elif path and path.lower() in arr_paths:
+                mismatched[path] = tmdb_id
+            elif path and not path.startswith(folder):
+                invalid_root.append(item)
+            else:
+                lookups.append((item, path, tmdb_id))
+
+        cached_lookups = self.config.Cache.query_radarr_lookups([str(t) for _, _, t in lookups]) if self.config.Cache else {}
+        to_lookup = []
+        for item, path, tmdb_id in lookups:
+            cached_folder, expired = cached_lookups[str(tmdb_id)] if str(tmdb_id) in cached_lookups else (None, True)
+            if expired is False and cached_folder == invalid_lookup:
+                invalid.append(item)
+            elif expired is False and f"{folder}/{cached_folder}".lower() in arr_paths:
+                path_in_use[f"{folder}/{cached_folder}"] = tmdb_id
+            else:
+                to_lookup.append(tmdb_id)
+
+        def lookup(tmdb_id):
             try:
-                if tmdb_id in arr_ids:
-                    exists.append(arr_ids[tmdb_id])
-                    continue
-                if path and path.lower() in arr_paths:
-                    mismatched[path] = tmdb_id
-                    continue
-                if path and not path.startswith(folder):
-                    invalid_root.append(item)
-                    continue
-                movie = self.api.get_movie(tmdb_id=tmdb_id)
-                logger.trace(f"Folder to Check: {folder}/{movie.folder}")
-                if f"{folder}/{movie.folder}".lower() in arr_paths:
-                    path_in_use[f"{folder}/{movie.folder}"] = tmdb_id
-                    continue
-                if path:
-                    movies.append((movie, path))
-                    path_lookup[path] = tmdb_id
-                else:
-                    movies.append(movie)
-            except ArrException:
+                return self.api.get_movie(tmdb_id=tmdb_id)
+            except (NotFound, Invalid) as e:
+                return e
+            except ArrException as e:
+                logger.error(f"Radarr Error: Lookup of {tmdb_id} failed: {e}")
+
+        found = {}
+        if to_lookup:
+            logger.info(f"Looking up {len(to_lookup)} TMDb ID{'s' if len(to_lookup) > 1 else ''} in Radarr")
+            with ThreadPoolExecutor(max_workers=self.config.general["max_workers"]) as executor:
+                found = {tmdb_id: result for tmdb_id, result in zip(to_lookup, executor.map(lookup, to_lookup))}
+            if self.config.Cache:
+                self.config.Cache.update_radarr_lookups([(str(k), invalid_lookup if isinstance(v, ArrException) else str(v.folder), False) for k, v in found.items() if v is not None])
+
+        for item, path, tmdb_id in lookups:
+            if tmdb_id not in found or found[tmdb_id] is None:
+                continue
+            movie = found[tmdb_id]
+            if isinstance(movie, ArrException):
                 invalid.append(item)
-            if len(movies) == 100 or len(tmdb_ids) == i:
+                continue
+            logger.trace(f"Folder to Check: {folder}/{movie.folder}")
+            if f"{folder}/{movie.folder}".lower() in arr_paths:
+                path_in_use[f"{folder}/{movie.folder}"] = tmdb_id
+                continue
+            if path:
+                movies.append((movie, path))
+                path_lookup[path] = tmdb_id
+            else:
+                movies.append(movie)
+            if len(movies) == 100:
                 mass_add()
                 movies = []
         if movies:
@@ -152,7 +213,9 @@ class Radarr:
                     if self.config.Cache:
                         self.config.Cache.update_radarr_adds(movie.tmdbId, self.library.original_mapping_name)
                 if upgrade_qp:
-                    self.api.edit_multiple_movies(upgrade_qp, quality_profile=qp)
+                    upgraded, _ = self.api.edit_multiple_movies(upgrade_qp, quality_profile=qp)
+                    for movie in upgraded:
+                        self._index(movie)
                     for movie in upgrade_qp:
                         logger.info(f"Quality Upgraded To {qp.name} | {movie.tmdbId:<7} | {movie.title}")
             if len(skipped) > 0:
@@ -193,6 +256,9 @@ class Radarr:
         logger.info(f"{apply_tags_translation[apply_tags].capitalize()} Radarr Tags: {tags}")
 
         edited, not_exists = self.api.edit_multiple_movies(tmdb_ids, tags=tags, apply_tags=apply_tags_translation[apply_tags], per_request=100)
+        if self._movies is not None:
+            for movie in edited:
+                self._index(movie)
 
         if len(edited) > 0:
             logger.info("")
@@ -206,35 +272,24 @@ class Radarr:
                 logger.info(f"TMDb ID Not in Radarr | {tmdb_id}")
 
     def remove_all_with_tags(self, tags):
-        lower_tags = [_t.lower() for _t in tags]
-        remove_items = []
-        for movie in self.api.all_movies():
-            tag_strs = [_t.label.lower() for _t in movie.tags]
-            remove = True
-            for tag in lower_tags:
-                if tag not in tag_strs:
-                    remove = False
-                    break
-            if remove:
-                remove_items.append(movie)
+        tag_ids = {t.label.lower(): t.id for t in self.api.all_tags()}
+        remove_ids = set(self.catalog)
+        for tag in [_t.lower() for _t in tags]:
+            remove_ids &= self._tags[tag_ids[tag]] if tag in tag_ids and tag_ids[tag] in self._tags else set()
+        remove_items = [movie for tmdb_id, movie in self.catalog.items() if tmdb_id in remove_ids]
         if remove_items:
             self.api.delete_multiple_movies(remove_items)
+            for movie in remove_items:
+                self._unindex(movie.tmdbId)
 
     def get_tmdb_ids(self, method, data):
-        ids = []
-        allowed = [t.id for t in self.api.all_tags() if t.label.lower() in data] if method == "radarr_taglist" else []
-        for movie in self.api.all_movies():
-            append = False
-            if method == "radarr_all":
-                append = True
-            elif method == "radarr_taglist":
-                if data:
-                    for tag in movie.tags:
-                        if tag.id in allowed:
-                            append = True
-                            break
-                elif not movie.tags:
-                    append = True
-            if append:
-                ids.append((movie.tmdbId, "tmdb"))
-        return ids
+        catalog = self.catalog
+        if method == "radarr_taglist" and data:
+            allowed = set()
+            for tag in self.api.all_tags():
+                if tag.label.lower() in data and tag.id in self._tags:
+                    allowed.update(self._tags[tag.id])
+            return [(tmdb_id, "tmdb") for tmdb_id in catalog if tmdb_id in allowed]
+        elif method == "radarr_taglist":
+            return [(tmdb_id, "tmdb") for tmdb_id, movie in catalog.items() if not movie.tags]
+        return [(tmdb_id, "tmdb") for tmdb_id in catalog]
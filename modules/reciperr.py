@@ -1,3 +1,4 @@
+from datetime import datetime
 from modules import util
 from modules.util import Failed
 
@@ -10,12 +11,19 @@ stevenlu_url = "https://s3.amazonaws.com/popular-movies/movies.json"
 class Reciperr:
     def __init__(self, config):
         self.config = config
+        self._lists = {}
 
     def _request(self, url, name="Reciperr"):
+        if url in self._lists:
+            data, fetched = self._lists[url]
+            logger.trace(f"Using {url} fetched at {fetched.strftime('%H:%M:%S')}")
+            return data
         response = self.config.get(url)
         if response.status_code >= 400:
             raise Failed(f"{name} Error: JSON not found at {url}")
-        return response.json()
+        data = response.json()
+        self._lists[url] = (data, datetime.now())
+        return data
 
     def validate_list(self, data):
         valid_lists = []
@@ -0,0 +1,153 @@
+import random, requests, threading, time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from modules import util
+from requests.adapters import HTTPAdapter
+
+logger = util.logger
+
+timeout = (10, 60)
+max_attempts = 6
+backoff_base = 2
+backoff_max = 60
+retry_statuses = [429, 500, 502, 503, 504]
+idempotent_methods = ["GET", "HEAD", "OPTIONS"]
+rate_limits = {
+    "imdb.com": (2, 4),
+    "letterboxd.com": (2, 4),
+    "themoviedb.org": (20, 20),
+    "flixpatrol.com": (2, 4),
+    "trakt.tv": (3, 3),
+    "mdblist.com": (2, 2),
+    "omdbapi.com": (5, 5),
+    "thetvdb.com": (1, 2),
+    "anilist.co": (1.5, 3),
+    "jikan.moe": (1, 3),
+    "anidb.net": (0.5, 1)
+}
+# Requests to these hosts run inside methods with their own @retry, so the session makes a single attempt for them
+retried_hosts = ["themoviedb.org", "trakt.tv", "thetvdb.com"]
+
+class TokenBucket:
+    def __init__(self, rate, capacity):
+        self.base_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def throttle(self):
+        with self.lock:
+            self.rate = max(self.base_rate / 8, self.rate / 2)
+
+    def pause(self, seconds):
+        with self.lock:
+            self.tokens = min(self.tokens, 0) - seconds * self.rate
+
+    def recover(self):
+        if self.rate < self.base_rate:
+            with self.lock:
+                self.rate = min(self.base_rate, self.rate + self.base_rate / 10)
+
+class Session(requests.Session):
+    def __init__(self, max_workers=1, rate_overrides=None):
+        super().__init__()
+        pool_size = max(10, max_workers)
+        self.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=pool_size))
+        self.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=pool_size))
+        self.host_adapters = {host: HTTPAdapter(pool_connections=4, pool_maxsize=pool_size) for host in rate_limits}
+        self.buckets = {host: TokenBucket(rate, capacity) for host, (rate, capacity) in rate_limits.items()}
+        if rate_overrides:
+            for host, rate in rate_overrides.items():
+                self.buckets[host] = TokenBucket(rate, rate * 2)
+        self.retried_hosts = set(retried_hosts)
+
+    def add_retried_host(self, url):
+        host = requests.utils.urlparse(url).hostname
+        if host:
+            self.retried_hosts.add(host)
+
+    def _match_host(self, url, hosts):
+        host = requests.utils.urlparse(url).hostname or ""
+        for match_host in hosts:
+            if host == match_host or host.endswith(f".{match_host}"):
+                return match_host
+
+    def get_adapter(self, url):
+        adapter_host = self._match_host(url, self.host_adapters)
+        return self.host_adapters[adapter_host] if adapter_host else super().get_adapter(url)
+
+    def close(self):
+        super().close()
+        for adapter in self.host_adapters.values():
+            adapter.close()
+
+    def _bucket(self, url):
+        limit_host = self._match_host(url, self.buckets)
+        return self.buckets[limit_host] if limit_host else None
+
+    def _retry_after(self, response, attempt):
+        wait = min(backoff_max, backoff_base ** attempt) * random.uniform(0.5, 1.5)
+        if response is not None and "Retry-After" in response.headers:
+            retry_after = response.headers["Retry-After"]
+            try:
+                wait = float(retry_after)
+            except ValueError:
+                try:
+                    wait = (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds()
+                except (TypeError, ValueError):
+                    pass
+        return min(max(wait, 0), backoff_max)
+
+    def _rate_limit_reset(self, response):
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        if remaining is None or not remaining.isdigit() or int(remaining) > 0:
+            return None
+        reset = response.headers.get("X-RateLimit-Reset")
+        if reset and reset.isdigit():
+            return min(max(int(reset) - time.time(), 0) if int(reset) > 1000000000 else int(reset), backoff_max)
+        return self._retry_after(response, 1)
+
+    def request(self, method, url, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = timeout
+        bucket = self._bucket(url)
+        idempotent = method.upper() in idempotent_methods
+        attempts = 1 if self._match_host(url, self.retried_hosts) else max_attempts
+        for attempt in range(1, attempts + 1):
+            if bucket:
+                bucket.acquire()
+            try:
+                response = super().request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt == attempts or not (idempotent or isinstance(e, requests.exceptions.ConnectTimeout)):
+                    raise
+                wait = self._retry_after(None, attempt)
+                logger.debug(f"Request Error: {e} retrying in {wait:.1f} seconds")
+            else:
+                if bucket and response.status_code in [429, 503]:
+                    bucket.throttle()
+                elif bucket:
+                    bucket.recover()
+                reset = self._rate_limit_reset(response) if bucket else None
+                if reset is not None:
+                    bucket.pause(reset)
+                if response.status_code not in retry_statuses or attempt == attempts or not (idempotent or response.status_code == 429):
+                    return response
+                wait = self._retry_after(response, attempt)
+                logger.debug(f"Request Error: {response.status_code} from {url} retrying in {wait:.1f} seconds")
+                response.close()
+            time.sleep(wait)
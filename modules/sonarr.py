@@ -1,11 +1,13 @@
+from concurrent.futures import ThreadPoolExecutor
 from modules import util
 from modules.util import Failed
 from arrapi import SonarrAPI
-from arrapi.exceptions import ArrException
+from arrapi.exceptions import ArrException, Invalid, NotFound
 
 logger = util.logger
 
 builders = ["sonarr_all", "sonarr_taglist"]
+invalid_lookup = "__invalid__"
 series_types = ["standard", "daily", "anime"]
 monitor_translation = {
     "all": "all", "future": "future", "missing": "missing", "existing": "existing",
@@ -58,6 +60,36 @@ class Sonarr:
         self.cutoff_search = params["cutoff_search"]
         self.sonarr_path = params["sonarr_path"] if params["sonarr_path"] and params["plex_path"] else ""
         self.plex_path = params["plex_path"] if params["sonarr_path"] and params["plex_path"] else ""
+        self._series = None
+        self._paths = {}
+        self._tags = {}
+
+    @property
+    def catalog(self):
+        if self._series is None:
+            self._series = {}
+            for series in self.api.all_series():
+                self._index(series)
+        return self._series
+
+    def _index(self, series):
+        self._unindex(series.tvdbId)
+        self._series[series.tvdbId] = series
+        if series.path:
+            self._paths[series.path[:-1].lower() if series.path.endswith(("/", "\\")) else series.path.lower()] = series.tvdbId
+        for tag in series.tags:
+            if tag.id not in self._tags:
+                self._tags[tag.id] = set()
+            self._tags[tag.id].add(series.tvdbId)
+
+    def _unindex(self, tvdb_id):
+        if tvdb_id in self._series:
+            old = self._series.pop(tvdb_id)
+            if old.path:
+                self._paths.pop(old.path[:-1].lower() if old.path.endswith(("/", "\\")) else old.path.lower(), None)
+            for tag in old.tags:
+                if tag.id in self._tags:
+                    self._tags[tag.id].discard(tvdb_id)
 
     def add_tvdb(self, tvdb_ids, **options):
         _ids = []
@@ -85,12 +117,8 @@ class Sonarr:
         search = options["search"] if "search" in options else self.search
         cutoff_search = options["cutoff_search"] if "cutoff_search" in options else self.cutoff_search
 
-        arr_paths = {}
-        arr_ids = {}
-        for series in self.api.all_series():
-            if series.path:
-                arr_paths[series.path[:-1].lower() if series.path.endswith(("/", "\\")) else series.path.lower()] = series.tvdbId
-            arr_ids[series.tvdbId] = series
+        arr_ids = self.catalog
+        arr_paths = self._paths
         logger.trace(arr_paths)
         logger.trace(arr_ids)
 
@@ -108,6 +136,8 @@ class Sonarr:
             try:
                 _a, _e, _i = self.api.add_multiple_series(shows, folder, quality_profile, language_profile, monitor,
                                                           season, search, cutoff_search, series_type, tags, per_request=100)
+                for series in _a:
+                    self._index(series)
                 added.extend(_a)
                 exists.extend(_e)
                 invalid.extend(_i)
@@ -115,6 +145,7 @@ class Sonarr:
                 logger.stacktrace()
                 raise Failed(f"Sonarr Error: {e}")
 
+        lookups = []
         for i, item in enumerate(tvdb_ids, 1):
             path = item[1] if isinstance(item, tuple) else None
             tvdb_id = item[0] if isinstance(item, tuple) else item
@@ -124,29 +155,59 @@ class Sonarr:
                 if _id:
                     skipped.append(item)
                     continue
+            if tvdb_id in arr_ids:
+                exists.append(arr_ids[tvdb_id])
+            elif path and path.lower() in arr_paths:
+                mismatched[path] = tvdb_id
+            elif path and not path.startswith(folder):
+                invalid_root.append(item)
+            else:
+                lookups.append((item, path, tvdb_id))
+
+        cached_lookups = self.config.Cache.query_sonarr_lookups([str(t) for _, _, t in lookups]) if self.config.Cache else {}
+        to_lookup = []
+        for item, path, tvdb_id in lookups:
+            cached_folder, expired = cached_lookups[str(tvdb_id)] if str(tvdb_id) in cached_lookups else (None, True)
+            if expired is False and cached_folder == invalid_lookup:
+                invalid.append(item)
+            elif expired is False and f"{folder}/{cached_folder}".lower() in arr_paths:
+                path_in_use[f"{folder}/{cached_folder}"] = tvdb_id
+            else:
+                to_lookup.append(tvdb_id)
+
+        def lookup(tvdb_id):
             try:
-                if tvdb_id in arr_ids:
-                    exists.append(arr_ids[tvdb_id])
-                    continue
-                if path and path.lower() in arr_paths:
-                    mismatched[path] = tvdb_id
-                    continue
-                if path and not path.startswith(folder):
-                    invalid_root.append(item)
-                    continue
-                show = self.api.get_series(tvdb_id=tvdb_id)
-                logger.trace(f"Folder to Check: {folder}/{show.folder}")
-                if f"{folder}/{show.folder}".lower() in arr_paths:
-                    path_in_use[f"{folder}/{show.folder}"] = tvdb_id
-                    continue
-                if path:
-                    shows.append((show, path))
-                    path_lookup[path] = tvdb_id
-                else:
-                    shows.append(show)
-            except ArrException:
+                return self.api.get_series(tvdb_id=tvdb_id)
+            except (NotFound, Invalid) as e:
+                return e
+            except ArrException as e:
+                logger.error(f"Sonarr Error: Lookup of {tvdb_id} failed: {e}")
+
+        found = {}
+        if to_lookup:
+            logger.info(f"Looking up {len(to_lookup)} TVDb ID{'s' if len(to_lookup) > 1 else ''} in Sonarr")
+            with ThreadPoolExecutor(max_workers=self.config.general["max_workers"]) as executor:
+                found = {tvdb_id: result for tvdb_id, result in zip(to_lookup, executor.map(lookup, to_lookup))}
+            if self.config.Cache:
+                self.config.Cache.update_sonarr_lookups([(str(k), invalid_lookup if isinstance(v, ArrException) else str(v.folder), False) for k, v in found.items() if v is not None])
+
+        for item, path, tvdb_id in lookups:
+            if tvdb_id not in found or found[tvdb_id] is None:
+                continue
+            show = found[tvdb_id]
+            if isinstance(show, ArrException):
                 invalid.append(item)
-            if len(shows) == 100 or len(tvdb_ids) == i:
+                continue
+            logger.trace(f"Folder to Check: {folder}/{show.folder}")
+            if f"{folder}/{show.folder}".lower() in arr_paths:
+                path_in_use[f"{folder}/{show.folder}"] = tvdb_id
+                continue
+            if path:
+                shows.append((show, path))
+                path_lookup[path] = tvdb_id
+            else:
+                shows.append(show)
+            if len(shows) == 100:
                 mass_add()
                 shows = []
         if shows:
@@ -178,7 +239,9 @@ class Sonarr:
                     if self.config.Cache:
                         self.config.Cache.update_sonarr_adds(series.tvdbId, self.library.original_mapping_name)
                 if upgrade_qp:
-                    self.api.edit_multiple_series(upgrade_qp, quality_profile=qp)
+                    upgraded, _ = self.api.edit_multiple_series(upgrade_qp, quality_profile=qp)
+                    for series in upgraded:
+                        self._index(series)
                     for series in upgrade_qp:
                         logger.info(f"Quality Upgraded To {qp.name} | {series.tvdbId:<7} | {series.title}")
             if len(skipped) > 0:
@@ -219,6 +282,9 @@ class Sonarr:
         logger.info(f"{apply_tags_translation[apply_tags].capitalize()} Sonarr Tags: {tags}")
 
         edited, not_exists = self.api.edit_multiple_series(tvdb_ids, tags=tags, apply_tags=apply_tags_translation[apply_tags], per_request=100)
+        if self._series is not None:
+            for series in edited:
+                self._index(series)
 
         if len(edited) > 0:
             logger.info("")
@@ -232,35 +298,24 @@ class Sonarr:
                 logger.info(f"TVDb ID Not in Sonarr | {tvdb_id}")
 
     def remove_all_with_tags(self, tags):
-        lower_tags = [_t.lower() for _t in tags]
-        remove_items = []
-        for series in self.api.all_series():
-            tag_strs = [_t.label.lower() for _t in series.tags]
-            remove = True
-            for tag in lower_tags:
-                if tag not in tag_strs:
-                    remove = False
-                    break
-            if remove:
-                remove_items.append(series)
+        tag_ids = {t.label.lower(): t.id for t in self.api.all_tags()}
+        remove_ids = set(self.catalog)
+        for tag in [_t.lower() for _t in tags]:
+            remove_ids &= self._tags[tag_ids[tag]] if tag in tag_ids and tag_ids[tag] in self._tags else set()
+        remove_items = [series for tvdb_id, series in self.catalog.items() if tvdb_id in remove_ids]
         if remove_items:
             self.api.delete_multiple_series(remove_items)
+            for series in remove_items:
+                self._unindex(series.tvdbId)
 
     def get_tvdb_ids(self, method, data):
-        ids = []
-        allowed = [t.id for t in self.api.all_tags() if t.label.lower() in data] if method == "sonarr_taglist" else []
-        for series in self.api.all_series():
-            append = False
-            if method == "sonarr_all":
-                append = True
-            elif method == "sonarr_taglist":
-                if data:
-                    for tag in series.tags:
-                        if tag.id in allowed:
-                            append = True
-                            break
-                elif not series.tags:
-                    append = True
-            if append:
-                ids.append((series.tvdbId, "tvdb"))
-        return ids
+        catalog = self.catalog
+        if method == "sonarr_taglist" and data:
+            allowed = set()
+            for tag in self.api.all_tags():
+                if tag.label.lower() in data and tag.id in self._tags:
+                    allowed.update(self._tags[tag.id])
+            return [(tvdb_id, "tvdb") for tvdb_id in catalog if tvdb_id in allowed]
+        elif method == "sonarr_taglist":
+            return [(tvdb_id, "tvdb") for tvdb_id, series in catalog.items() if not series.tags]
+        return [(tvdb_id, "tvdb") for tvdb_id in catalog]
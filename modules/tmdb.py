@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from modules import util
 from modules.util import Failed
 from retrying import retry
@@ -100,11 +101,13 @@ class TMDBObj:
 
 
 class TMDbMovie(TMDBObj):
-    def __init__(self, tmdb, tmdb_id, ignore_cache=False):
+    def __init__(self, tmdb, tmdb_id, ignore_cache=False, cache_data=None):
         super().__init__(tmdb, tmdb_id, ignore_cache=ignore_cache)
         expired = None
         data = None
-        if self._tmdb.config.Cache and not ignore_cache:
+        if cache_data:
+            data, expired = cache_data
+        elif self._tmdb.config.Cache and not ignore_cache:
             data, expired = self._tmdb.config.Cache.query_tmdb_movie(tmdb_id, self._tmdb.expiration)
         if expired or not data:
             data = self.load_movie()
@@ -116,7 +119,7 @@ class TMDbMovie(TMDBObj):
         self.collection_id = data["collection_id"] if isinstance(data, dict) else data.collection.id if data.collection else None
         self.collection_name = data["collection_name"] if isinstance(data, dict) else data.collection.name if data.collection else None
 
-        if self._tmdb.config.Cache and not ignore_cache:
+        if self._tmdb.config.Cache and not ignore_cache and expired is not False:
             self._tmdb.config.Cache.update_tmdb_movie(expired, self, self._tmdb.expiration)
 
     @retry(stop_max_attempt_number=6, wait_fixed=10000, retry_on_exception=util.retry_if_not_failed)
@@ -128,11 +131,13 @@ class TMDbMovie(TMDBObj):
 
 
 class TMDbShow(TMDBObj):
-    def __init__(self, tmdb, tmdb_id, ignore_cache=False):
+    def __init__(self, tmdb, tmdb_id, ignore_cache=False, cache_data=None):
         super().__init__(tmdb, tmdb_id, ignore_cache=ignore_cache)
         expired = None
         data = None
-        if self._tmdb.config.Cache and not ignore_cache:
+        if cache_data:
+            data, expired = cache_data
+        elif self._tmdb.config.Cache and not ignore_cache:
             data, expired = self._tmdb.config.Cache.query_tmdb_show(tmdb_id, self._tmdb.expiration)
         if expired or not data:
             data = self.load_show()
@@ -150,7 +155,7 @@ class TMDbShow(TMDBObj):
         loop = data.seasons if not isinstance(data, dict) else data["seasons"].split("|") if data["seasons"] else []
         self.seasons = [TMDbSeason(s) for s in loop]
 
-        if self._tmdb.config.Cache and not ignore_cache:
+        if self._tmdb.config.Cache and not ignore_cache and expired is not False:
             self._tmdb.config.Cache.update_tmdb_show(expired, self, self._tmdb.expiration)
 
     @retry(stop_max_attempt_number=6, wait_fixed=10000, retry_on_exception=util.retry_if_not_failed)
@@ -167,6 +172,8 @@ class TMDb:
         self.language = params["language"]
         self.region = None
         self.expiration = params["expiration"]
+        self._items = {}
+        self._episode_ratings = {}
         logger.secret(self.apikey)
         try:
             self.TMDb = TMDbAPIs(self.apikey, language=self.language, session=self.config.session)
@@ -214,17 +221,66 @@ class TMDb:
                 except Failed:                  raise Failed(f"TMDb Error: No Movie or Collection found for TMDb ID {tmdb_id}")
         else:                           return self.get_show(tmdb_id)
 
+    def _get_item(self, tmdb_id, is_movie, ignore_cache=False, cache_data=None):
+        key = (tmdb_id, is_movie, ignore_cache)
+        if key not in self._items:
+            try:
+                self._items[key] = TMDbMovie(self, tmdb_id, ignore_cache=ignore_cache, cache_data=cache_data) if is_movie else TMDbShow(self, tmdb_id, ignore_cache=ignore_cache, cache_data=cache_data)
+            except Failed as e:
+                self._items[key] = e
+        if isinstance(self._items[key], Failed):
+            raise self._items[key]
+        return self._items[key]
+
     def get_movie(self, tmdb_id, ignore_cache=False):
-        return TMDbMovie(self, tmdb_id, ignore_cache=ignore_cache)
+        return self._get_item(tmdb_id, True, ignore_cache=ignore_cache)
 
     def get_show(self, tmdb_id, ignore_cache=False):
-        return TMDbShow(self, tmdb_id, ignore_cache=ignore_cache)
+        return self._get_item(tmdb_id, False, ignore_cache=ignore_cache)
+
+    def prefetch(self, tmdb_ids, is_movie, ignore_cache=False):
+        tmdb_ids = [t for t in set(tmdb_ids) if t and (t, is_movie, ignore_cache) not in self._items]
+        if not tmdb_ids:
+            return
+        cache_data = {}
+        if self.config.Cache and not ignore_cache:
+            cache_data = self.config.Cache.query_tmdb_movies(tmdb_ids, self.expiration) if is_movie else self.config.Cache.query_tmdb_shows(tmdb_ids, self.expiration)
+        missing = []
+        for tmdb_id in tmdb_ids:
+            if tmdb_id in cache_data and cache_data[tmdb_id][1] is False:
+                self._get_item(tmdb_id, is_movie, cache_data=cache_data[tmdb_id])
+            else:
+                missing.append(tmdb_id)
+        logger.debug(f"TMDb Prefetch: {len(tmdb_ids) - len(missing)} Cached, {len(missing)} to Fetch")
+
+        def get_item(tmdb_id):
+            try:
+                self._get_item(tmdb_id, is_movie, ignore_cache=ignore_cache, cache_data=cache_data[tmdb_id] if tmdb_id in cache_data else None)
+            except Failed as e:
+                logger.debug(e)
+
+        with ThreadPoolExecutor(max_workers=self.config.general["max_workers"]) as executor:
+            for future in as_completed([executor.submit(get_item, t) for t in missing]):
+                future.result()
 
     @retry(stop_max_attempt_number=6, wait_fixed=10000, retry_on_exception=util.retry_if_not_failed)
     def get_season(self, tmdb_id, season_number, partial=None):
         try:                            return self.TMDb.tv_season(tmdb_id, season_number, partial=partial)
         except NotFound as e:           raise Failed(f"TMDb Error: No Season found for TMDb ID {tmdb_id} Season {season_number}: {e}")
 
+    def get_episode_ratings(self, tmdb_id, season_number):
+        if season_number is None:
+            return None
+        key = (tmdb_id, int(season_number))
+        if key not in self._episode_ratings:
+            try:
+                self._episode_ratings[key] = {e.episode_number: e.vote_average for e in self.get_season(tmdb_id, season_number).episodes}
+            except Failed as e:
+                self._episode_ratings[key] = e
+        if isinstance(self._episode_ratings[key], Failed):
+            raise self._episode_ratings[key]
+        return self._episode_ratings[key]
+
     @retry(stop_max_attempt_number=6, wait_fixed=10000, retry_on_exception=util.retry_if_not_failed)
     def get_episode(self, tmdb_id, season_number, episode_number, partial=None):
         try:                            return self.TMDb.tv_episode(tmdb_id, season_number, episode_number, partial=partial)
@@ -381,14 +437,18 @@ class TMDb:
                 logger.info(f"Processing {pretty}: ({tmdb_id}) {tmdb_name} ({len(ids)} Item{'' if len(ids) == 1 else 's'})")
         return ids
 
-    def get_item(self, item, tmdb_id, tvdb_id, imdb_id, is_movie=True):
-        tmdb_item = None
+    def get_tmdb_id(self, tmdb_id, tvdb_id, imdb_id, is_movie=True):
         if tvdb_id and not tmdb_id:
             tmdb_id = self.config.Convert.tvdb_to_tmdb(tvdb_id)
         if imdb_id and not tmdb_id:
             _id, _type = self.config.Convert.imdb_to_tmdb(imdb_id)
             if _id and ((_type == "movie" and is_movie) or (_type == "show" and not is_movie)):
                 tmdb_id = _id
+        return tmdb_id
+
+    def get_item(self, item, tmdb_id, tvdb_id, imdb_id, is_movie=True):
+        tmdb_item = None
+        tmdb_id = self.get_tmdb_id(tmdb_id, tvdb_id, imdb_id, is_movie=is_movie)
         if tmdb_id:
             try:
                 tmdb_item = self.get_movie(tmdb_id) if is_movie else self.get_show(tmdb_id)
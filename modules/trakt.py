@@ -1,4 +1,5 @@
 import requests, time, webbrowser
+from concurrent.futures import ThreadPoolExecutor
 from modules import util
 from modules.util import Failed, TimeoutExpired, YAML
 from retrying import retry
@@ -196,6 +197,14 @@ class Trakt:
             return True
         return False
 
+    def _response_json(self, response):
+        if response.status_code >= 400:
+            raise Failed(f"({response.status_code}) {response.reason}")
+        json_data = response.json()
+        logger.trace(f"Headers: {response.headers}")
+        logger.trace(f"Response: {json_data}")
+        return json_data
+
     @retry(stop_max_attempt_number=6, wait_fixed=10000, retry_on_exception=util.retry_if_not_failed)
     def _request(self, url, params=None, json=None):
         headers = {
@@ -204,35 +213,29 @@ class Trakt:
             "trakt-api-version": "2",
             "trakt-api-key": self.client_id
         }
-        output_json = []
         if params is None:
             params = {}
-        pages = 1
-        current = 1
         logger.trace(f"URL: {base_url}{url}")
         if params:
             logger.trace(f"Params: {params}")
         if json:
             logger.trace(f"JSON: {json}")
-        while current <= pages:
-            if pages > 1:
-                params["page"] = current
-            if json is not None:
-                response = self.config.post(f"{base_url}{url}", json=json, headers=headers)
-            else:
-                response = self.config.get(f"{base_url}{url}", headers=headers, params=params)
-            if pages == 1 and "X-Pagination-Page-Count" in response.headers and not params:
-                pages = int(response.headers["X-Pagination-Page-Count"])
-            if response.status_code >= 400:
-                raise Failed(f"({response.status_code}) {response.reason}")
-            json_data = response.json()
-            logger.trace(f"Headers: {response.headers}")
-            logger.trace(f"Response: {json_data}")
-            if isinstance(json_data, dict):
-                return json_data
-            else:
-                output_json.extend(json_data)
-            current += 1
+        if json is not None:
+            response = self.config.post(f"{base_url}{url}", json=json, headers=headers)
+        else:
+            response = self.config.get(f"{base_url}{url}", headers=headers, params=params)
+        pages = int(response.headers["X-Pagination-Page-Count"]) if "X-Pagination-Page-Count" in response.headers and not params else 1
+        json_data = self._response_json(response)
+        if isinstance(json_data, dict) or pages <= 1:
+            return json_data
+        output_json = list(json_data)
+
+        def get_page(page_num):
+            return self._response_json(self.config.get(f"{base_url}{url}", headers=headers, params={"page": page_num}))
+
+        with ThreadPoolExecutor(max_workers=self.config.general["max_workers"]) as executor:
+            for page_data in executor.map(get_page, range(2, pages + 1)):
+                output_json.extend(page_data)
         return output_json
 
     def user_ratings(self, is_movie):
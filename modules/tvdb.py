@@ -1,4 +1,5 @@
-import requests, time
+import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from lxml.etree import ParserError
 from modules import util
@@ -40,14 +41,16 @@ language_translation = {
     "yo": "yor", "za": "zha", "zu": "zul"}
 
 class TVDbObj:
-    def __init__(self, tvdb, tvdb_id, is_movie=False, ignore_cache=False):
+    def __init__(self, tvdb, tvdb_id, is_movie=False, ignore_cache=False, cache_data=None):
         self._tvdb = tvdb
         self.tvdb_id = tvdb_id
         self.is_movie = is_movie
         self.ignore_cache = ignore_cache
         expired = None
         data = None
-        if self._tvdb.config.Cache and not ignore_cache:
+        if cache_data:
+            data, expired = cache_data
+        elif self._tvdb.config.Cache and not ignore_cache:
             data, expired = self._tvdb.config.Cache.query_tvdb(tvdb_id, is_movie, self._tvdb.expiration)
         if expired or not data:
             data = self._tvdb.get_request(f"{urls['movie_id' if is_movie else 'series_id']}{tvdb_id}")
@@ -93,7 +96,7 @@ class TVDbObj:
 
             self.genres = parse_page("//strong[text()='Genres']/parent::li/span/a/text()[normalize-space()]", is_list=True)
 
-        if self._tvdb.config.Cache and not ignore_cache:
+        if self._tvdb.config.Cache and not ignore_cache and expired is not False:
             self._tvdb.config.Cache.update_tvdb(expired, self, self._tvdb.expiration)
 
 class TVDb:
@@ -101,13 +104,48 @@ class TVDb:
         self.config = config
         self.language = tvdb_language
         self.expiration = expiration
+        self._objs = {}
+
+    def _get_obj(self, tvdb_id, is_movie, cache_data=None):
+        key = (tvdb_id, is_movie)
+        if key not in self._objs:
+            try:
+                self._objs[key] = TVDbObj(self, tvdb_id, is_movie=is_movie, cache_data=cache_data)
+            except Failed as e:
+                self._objs[key] = e
+        if isinstance(self._objs[key], Failed):
+            raise self._objs[key]
+        return self._objs[key]
 
     def get_tvdb_obj(self, tvdb_url, is_movie=False):
         tvdb_id, _, _ = self.get_id_from_url(tvdb_url, is_movie=is_movie)
-        return TVDbObj(self, tvdb_id, is_movie=is_movie)
+        return self._get_obj(tvdb_id, is_movie)
+
+    def prefetch(self, tvdb_ids, is_movie=False):
+        tvdb_ids = [t for t in set(tvdb_ids) if t and (t, is_movie) not in self._objs]
+        if not tvdb_ids:
+            return
+        cache_data = self.config.Cache.query_tvdbs(tvdb_ids, is_movie, self.expiration) if self.config.Cache else {}
+        missing = []
+        for tvdb_id in tvdb_ids:
+            if tvdb_id in cache_data and cache_data[tvdb_id][1] is False:
+                self._get_obj(tvdb_id, is_movie, cache_data=cache_data[tvdb_id])
+            else:
+                missing.append(tvdb_id)
+        logger.debug(f"TVDb Prefetch: {len(tvdb_ids) - len(missing)} Cached, {len(missing)} to Fetch")
+
+        def get_obj(tvdb_id):
+            try:
+                self._get_obj(tvdb_id, is_movie, cache_data=cache_data[tvdb_id] if tvdb_id in cache_data else None)
+            except Failed as e:
+                logger.debug(e)
+
+        with ThreadPoolExecutor(max_workers=self.config.general["max_workers"]) as executor:
+            for future in as_completed([executor.submit(get_obj, t) for t in missing]):
+                future.result()
 
     def get_list_description(self, tvdb_url):
-        response = self.config.get_html(tvdb_url, headers=util.header(self.language))
+        response = self.config.get_html(tvdb_url, headers=util.header(self.language), cache=True)
         description = response.xpath("//div[@class='block']/div[not(@style='display:none')]/p/text()")
         return description[0] if len(description) > 0 and len(description[0]) > 0 else ""
 
@@ -131,11 +169,10 @@ class TVDb:
         else:
             raise Failed(f"TVDb Error: {tvdb_url} must begin with {urls['movies']} or {urls['series']}")
         expired = None
-        tvdb_id = None
         if self.config.Cache and not ignore_cache:
-            tvdb_id, expired = self.config.Cache.query_tvdb_map(tvdb_url, self.expiration)
-        if tvdb_id and not expired and not is_movie:
-            return tvdb_id, None, None
+            tvdb_id, tmdb_id, imdb_id, expired = self.config.Cache.query_tvdb_map(tvdb_url, self.expiration)
+            if tvdb_id and not expired and (media_type == "Series" or tmdb_id or imdb_id):
+                return tvdb_id, tmdb_id, imdb_id
         logger.trace(f"URL: {tvdb_url}")
         try:
             response = self.get_request(tvdb_url)
@@ -162,7 +199,7 @@ class TVDb:
                 if tmdb_id is None and imdb_id is None:
                     raise Failed(f"TVDb Error: No TMDb ID or IMDb ID found")
             if self.config.Cache and not ignore_cache:
-                self.config.Cache.update_tvdb_map(expired, tvdb_url, tvdb_id, self.expiration)
+                self.config.Cache.update_tvdb_map(expired, tvdb_url, tvdb_id, tmdb_id, imdb_id, self.expiration)
             return tvdb_id, tmdb_id, imdb_id
         elif tvdb_url.startswith(urls["movie_id"]):
             err_text = f"using TVDb Movie ID: {tvdb_url[len(urls['movie_id']):]}"
@@ -178,30 +215,34 @@ class TVDb:
         logger.trace(f"URL: {tvdb_url}")
         if tvdb_url.startswith((urls["list"], urls["alt_list"])):
             try:
-                response = self.config.get_html(tvdb_url, headers=util.header(self.language))
-                items = response.xpath("//div[@class='row']/div/div[@class='row']/div/h3/a")
-                for item in items:
-                    title = item.xpath("text()")[0]
-                    item_url = item.xpath("@href")[0]
-                    if item_url.startswith("/series/"):
-                        try:
-                            tvdb_id, _, _ = self.get_id_from_url(f"{base_url}{item_url}")
-                            if tvdb_id:
-                                ids.append((tvdb_id, "tvdb"))
-                        except Failed as e:
-                            logger.error(f"{e} for series {title}")
-                    elif item_url.startswith("/movies/"):
-                        try:
-                            _, tmdb_id, imdb_id = self.get_id_from_url(f"{base_url}{item_url}")
-                            if tmdb_id:
-                                ids.append((tmdb_id, "tmdb"))
-                            elif imdb_id:
-                                ids.append((imdb_id, "imdb"))
-                        except Failed as e:
-                            logger.error(f"{e} for movie {title}")
-                    else:
-                        logger.error(f"TVDb Error: Skipping Movie: {title}")
-                    time.sleep(2)
+                response = self.config.get_html(tvdb_url, headers=util.header(self.language), cache=True)
+                items = [(item.xpath("text()")[0], item.xpath("@href")[0]) for item in response.xpath("//div[@class='row']/div/div[@class='row']/div/h3/a")]
+
+                def get_ids(item_url):
+                    if item_url.startswith(("/series/", "/movies/")):
+                        return self.get_id_from_url(f"{base_url}{item_url}")
+
+                with ThreadPoolExecutor(max_workers=self.config.general["max_workers"]) as executor:
+                    futures = [executor.submit(get_ids, item_url) for _, item_url in items]
+                    for (title, item_url), future in zip(items, futures):
+                        if item_url.startswith("/series/"):
+                            try:
+                                tvdb_id, _, _ = future.result()
+                                if tvdb_id:
+                                    ids.append((tvdb_id, "tvdb"))
+                            except Failed as e:
+                                logger.error(f"{e} for series {title}")
+                        elif item_url.startswith("/movies/"):
+                            try:
+                                _, tmdb_id, imdb_id = future.result()
+                                if tmdb_id:
+                                    ids.append((tmdb_id, "tmdb"))
+                                elif imdb_id:
+                                    ids.append((imdb_id, "imdb"))
+                            except Failed as e:
+                                logger.error(f"{e} for movie {title}")
+                        else:
+                            logger.error(f"TVDb Error: Skipping Movie: {title}")
                 if len(ids) > 0:
                     return ids
                 raise Failed(f"TVDb Error: No TVDb IDs found at {tvdb_url}")
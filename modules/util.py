@@ -1,4 +1,4 @@
-import glob, logging, os, re, requests, ruamel.yaml, signal, sys, time
+import bisect, glob, logging, os, re, requests, ruamel.yaml, signal, sys, time
 from datetime import datetime, timedelta
 from num2words import num2words
 from pathvalidate import is_valid_filename, sanitize_filename
@@ -207,6 +207,28 @@ def add_dict_list(keys, value, dict_map):
         else:
             dict_map[key] = [value]
 
+def longest_increasing_subsequence(values):
+    tails = []
+    tail_indexes = []
+    previous = [None] * len(values)
+    for i, value in enumerate(values):
+        if value is None:
+            continue
+        pos = bisect.bisect_left(tails, value)
+        previous[i] = tail_indexes[pos - 1] if pos > 0 else None
+        if pos == len(tails):
+            tails.append(value)
+            tail_indexes.append(i)
+        else:
+            tails[pos] = value
+            tail_indexes[pos] = i
+    indexes = set()
+    i = tail_indexes[-1] if tail_indexes else None
+    while i is not None:
+        indexes.add(i)
+        i = previous[i]
+    return indexes
+
 def get_list(data, lower=False, upper=False, split=True, int_list=False, trim=True):
     if split is True:               split = ","
     if data is None:                return None
@@ -476,7 +498,7 @@ def is_date_filter(value, modifier, data, final, current_time):
     elif modifier == ".regex":
         jailbreak = True
         for check_data in data:
-            if re.compile(check_data).match(value.strftime("%m/%d/%Y")):
+            if (check_data if isinstance(check_data, re.Pattern) else re.compile(check_data)).match(value.strftime("%m/%d/%Y")):
                 jailbreak = True
                 break
         if not jailbreak:
@@ -502,7 +524,7 @@ def is_string_filter(values, modifier, data):
                     or (modifier in [".is", ".isnot"] and value.lower() == check_value.lower()) \
                     or (modifier == ".begins" and value.lower().startswith(check_value.lower())) \
                     or (modifier == ".ends" and value.lower().endswith(check_value.lower())) \
-                    or (modifier == ".regex" and re.compile(check_value).search(value)):
+                    or (modifier == ".regex" and (check_value if isinstance(check_value, re.Pattern) else re.compile(check_value)).search(value)):
                 jailbreak = True
                 break
         if jailbreak: break
@@ -260,7 +260,11 @@ def run_config(config, stats):
     if (config.playlist_files or config.general["playlist_report"]) and not overlays_only and not operations_only and not collection_only and not config.requested_metadata_files:
         logger.add_playlists_handler()
         if config.playlist_files:
-            playlist_status, playlist_stats = run_playlists(config)
+            try:
+                playlist_status, playlist_stats = run_playlists(config)
+            finally:
+                for library in config.libraries:
+                    library.save_report_file()
         if config.general["playlist_report"]:
             ran = []
             for library in config.libraries:
@@ -406,6 +410,7 @@ def run_libraries(config):
             logger.separator(f"Skipping {library.name} Library")
             continue
         library_status[library.name] = {}
+        library.start_report_file()
         try:
             logger.add_library_handler(library.mapping_name)
             plexapi.server.TIMEOUT = library.timeout
@@ -450,27 +455,19 @@ def run_libraries(config):
                 library_status[library.name]["All Collections Deleted"] = str(datetime.now() - time_start).split('.')[0]
 
             time_start = datetime.now()
-            temp_items = None
-            list_key = None
-            expired = None
-            if config.Cache:
-                list_key, expired = config.Cache.query_list_cache("library", library.mapping_name, 1)
-                if cache_libraries and list_key and expired is False:
-                    logger.info(f"Library: {library.mapping_name} loaded from Cache")
-                    temp_items = config.Cache.query_list_ids(list_key)
-
-            if not temp_items:
+            snapshot_at = None
+            if config.Cache and cache_libraries:
+                temp_items, snapshot_at = library.load_snapshot()
+            else:
                 temp_items = library.cache_items()
-                if config.Cache and list_key:
-                    config.Cache.delete_list_ids(list_key)
-                if config.Cache and cache_libraries:
-                    list_key = config.Cache.update_list_cache("library", library.mapping_name, expired, 1)
-                    config.Cache.update_list_ids(list_key, [(i.ratingKey, i.guid) for i in temp_items])
+            results = None
             if not library.is_music:
                 logger.info("")
                 logger.separator(f"Mapping {library.name} Library", space=False, border=False)
                 logger.info("")
-                library.map_guids(temp_items)
+                results = library.map_guids(temp_items)
+            if config.Cache and cache_libraries:
+                library.save_snapshot(temp_items, results, snapshot_at)
             library_status[library.name]["Library Loading and Mapping"] = str(datetime.now() - time_start).split('.')[0]
 
             def run_operations_and_overlays():
@@ -520,6 +517,8 @@ def run_libraries(config):
             library.notify(e)
             logger.stacktrace()
             logger.critical(e)
+        finally:
+            library.save_report_file()
     return library_status
 
 def run_collection(config, library, metadata, requested_collections):